@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+"""
+Throughput benchmark for the reliable enrichment pipeline
+Generates synthetic species tables, runs ReliablePlantProcessor against the local
+stand-in API with cold, warm and half-warm caches, and writes the results as JSON.
+"""
+
+import json
+import os
+import sys
+import time
+import shutil
+import logging
+import argparse
+import tempfile
+import resource
+import multiprocessing
+from queue import Empty
+from pathlib import Path
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+
+import local_api_server
+
+REPO_DIR = Path(__file__).resolve().parent
+TEMPLATE_TABLE = REPO_DIR / "data" / "enhanced_species_table_final.csv"
+
+GENERA = ['abies', 'acacia', 'acer', 'betula', 'fagus', 'magnolia', 'pinus', 'quercus', 'salix', 'viburnum']
+SCENARIOS = ['cold', 'warm', 'half']
+
+def species_name(i: int) -> str:
+    """Deterministic, valid binomial for index i"""
+    epithet = ''
+    n = i
+    while True:
+        n, digit = divmod(n, 26)
+        epithet = chr(ord('a') + digit) + epithet
+        if n == 0:
+            break
+    return f"{GENERA[i % len(GENERA)]} bench{epithet}"
+
+def generate_input(path: Path, size: int):
+    """Write a table with the real column layout and size unenriched species"""
+    columns = pd.read_csv(TEMPLATE_TABLE, nrows=0).columns
+    df = pd.DataFrame('', index=range(size), columns=columns)
+    df['SPECIES'] = [species_name(i) for i in range(size)]
+    df['GENUS'] = df['SPECIES'].str.split().str[0]
+    df.to_csv(path, index=False)
+
+def write_config(path: Path, cache_dir: Path, base_urls: Dict[str, str], concurrency: int):
+    """Processor config pointing at the stand-in with rate limits out of the way"""
+    with open(REPO_DIR / "config.json", 'r') as f:
+        config = json.load(f)
+    
+    config.update({
+        'base_urls': base_urls,
+        'cache_dir': str(cache_dir),
+        'max_concurrency': concurrency,
+        'rate_limits': {
+            'gbif': {'requests_per_second': 1e6, 'burst': 1e6},
+            'tropicos': {'requests_per_second': 1e6, 'burst': 1e6}
+        },
+        'retry_backoff': 0.05
+    })
+    with open(path, 'w') as f:
+        json.dump(config, f, indent=2)
+
+CHILD_POLL_SECONDS = 5.0  # How often the parent checks that the child is still alive
+
+def run_scenario(work_dir: str, config_file: str, input_file: str, use_async: bool, queue):
+    """Child process: report the scenario's measurements, or the error that stopped it"""
+    try:
+        queue.put({'result': measure_scenario(work_dir, config_file, input_file, use_async)})
+    except Exception as e:
+        queue.put({'error': f"{type(e).__name__}: {e}"})
+        raise
+
+def measure_scenario(work_dir: str, config_file: str, input_file: str, use_async: bool) -> Dict:
+    """Run the processor once and return timings, cache stats and peak RSS"""
+    os.chdir(work_dir)
+    logging.disable(logging.INFO)
+    
+    sys.path.insert(0, str(REPO_DIR))
+    import asyncio
+    from reliable_plant_processor import ReliablePlantProcessor
+    
+    processor = ReliablePlantProcessor(config_file)
+    latencies: List[float] = []
+    aggregate = processor._aggregate_plant_data
+    
+    def timed_aggregate(*args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return aggregate(*args, **kwargs)
+        finally:
+            latencies.append(time.perf_counter() - started)
+    
+    processor._aggregate_plant_data = timed_aggregate
+    output_file = str(Path(work_dir) / "output.csv")
+    
+    started = time.perf_counter()
+    try:
+        if use_async:
+            asyncio.run(processor.process_csv_files_async([(input_file, output_file)]))
+        else:
+            processor.process_csv_files([(input_file, output_file)])
+    finally:
+        processor.close()
+    elapsed = time.perf_counter() - started
+    
+    lookups = hits = 0
+    for adapter in processor.adapters:
+        stats = adapter.cache_stats()
+        lookups += stats['memory_hits'] + stats['memory_misses']
+        hits += stats['memory_hits'] + stats['disk_hits']
+    
+    return {
+        'elapsed_s': elapsed,
+        'latencies': latencies,
+        'peak_rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        'cache_hit_ratio': hits / lookups if lookups else None
+    }
+
+def run_in_child(work_dir: Path, config_file: Path, input_file: Path, use_async: bool) -> Dict:
+    """Run one scenario in a fresh process so peak RSS is measured per run
+    
+    Raises RuntimeError if the child fails or exits without reporting a result.
+    """
+    context = multiprocessing.get_context('spawn')
+    queue = context.Queue()
+    process = context.Process(target=run_scenario,
+                              args=(str(work_dir), str(config_file), str(input_file), use_async, queue))
+    process.start()
+    try:
+        message = None
+        while message is None:
+            # Read before joining: a child blocks on exit until its queued result is consumed
+            exited = process.exitcode is not None
+            try:
+                message = queue.get(timeout=CHILD_POLL_SECONDS)
+            except Empty:
+                if exited:
+                    raise RuntimeError(f"Benchmark child exited with code {process.exitcode} "
+                                       f"without a result")
+    finally:
+        if process.is_alive() and message is None:
+            process.terminate()
+        process.join()
+    
+    if 'error' in message:
+        raise RuntimeError(f"Benchmark child failed: {message['error']}")
+    return message['result']
+
+def benchmark_size(size: int, server, root: Path, args) -> List[Dict]:
+    """Run every scenario for one table size"""
+    size_dir = root / f"size_{size}"
+    size_dir.mkdir()
+    input_file = size_dir / "input.csv"
+    half_file = size_dir / "half.csv"
+    generate_input(input_file, size)
+    generate_input(half_file, size // 2)
+    
+    results = []
+    for scenario in args.scenarios:
+        work_dir = size_dir / scenario
+        work_dir.mkdir()
+        cache_dir = work_dir / "cache"
+        config_file = work_dir / "config.json"
+        write_config(config_file, cache_dir, server.base_urls, args.concurrency)
+        
+        if scenario == 'warm':
+            run_in_child(work_dir, config_file, input_file, args.use_async)
+        elif scenario == 'half':
+            run_in_child(work_dir, config_file, half_file, args.use_async)
+        
+        requests_before = server.stats['requests']
+        run = run_in_child(work_dir, config_file, input_file, args.use_async)
+        latencies_ms = np.array(run['latencies']) * 1000
+        
+        result = {
+            'size': size,
+            'scenario': scenario,
+            'mode': 'async' if args.use_async else 'sync',
+            'elapsed_s': round(run['elapsed_s'], 3),
+            'rows_per_s': round(size / run['elapsed_s'], 1) if run['elapsed_s'] else None,
+            'species_looked_up': len(latencies_ms),
+            'latency_p50_ms': round(float(np.percentile(latencies_ms, 50)), 3) if len(latencies_ms) else None,
+            'latency_p99_ms': round(float(np.percentile(latencies_ms, 99)), 3) if len(latencies_ms) else None,
+            'peak_rss_mb': round(run['peak_rss_mb'], 1),
+            'cache_hit_ratio': round(run['cache_hit_ratio'], 4) if run['cache_hit_ratio'] is not None else None,
+            'api_requests': server.stats['requests'] - requests_before
+        }
+        results.append(result)
+        print(f"{size:>9} {scenario:>5}  {result['rows_per_s']:>10} rows/s  "
+              f"p50 {result['latency_p50_ms']} ms  p99 {result['latency_p99_ms']} ms  "
+              f"rss {result['peak_rss_mb']} MB  hit ratio {result['cache_hit_ratio']}")
+        
+        if not args.keep:
+            shutil.rmtree(cache_dir, ignore_errors=True)
+    
+    return results
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description="Benchmark ReliablePlantProcessor against the local stand-in API")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000, 1000000])
+    parser.add_argument('--scenarios', nargs='+', choices=SCENARIOS, default=SCENARIOS)
+    parser.add_argument('--sync', dest='use_async', action='store_false', help="Use the sequential path")
+    parser.add_argument('--concurrency', type=int, default=32, help="max_concurrency for the async path")
+    parser.add_argument('--latency-ms', type=float, default=20.0, help="Stand-in API latency per request")
+    parser.add_argument('--latency-jitter-ms', type=float, default=5.0)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--throttle-rate', type=float, default=0.0)
+    parser.add_argument('--output', default='benchmark_results.json', help="Where to write the JSON results")
+    parser.add_argument('--keep', action='store_true', help="Keep generated inputs, outputs and caches")
+    args = parser.parse_args()
+    
+    server = local_api_server.start_server(
+        latency_ms=args.latency_ms,
+        latency_jitter_ms=args.latency_jitter_ms,
+        error_rate=args.error_rate,
+        throttle_rate=args.throttle_rate,
+        seed=0
+    )
+    root = Path(tempfile.mkdtemp(prefix="plant_benchmark_"))
+    
+    results = []
+    try:
+        for size in args.sizes:
+            results.extend(benchmark_size(size, server, root, args))
+    finally:
+        server.shutdown()
+        if args.keep:
+            print(f"Benchmark files kept in {root}")
+        else:
+            shutil.rmtree(root, ignore_errors=True)
+    
+    with open(args.output, 'w') as f:
+        json.dump({
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'settings': {key: value for key, value in vars(args).items() if key not in ('output', 'keep')},
+            'results': results
+        }, f, indent=2)
+    print(f"Results written to {args.output}")
+
+if __name__ == "__main__":
+    main()
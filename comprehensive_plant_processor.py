@@ -1,10 +1,11 @@
 #!/usr/bin/env python3
 import pandas as pd
 import numpy as np
+from plant_table_io import read_table, write_table
 import json
 
 # Read the partially updated CSV
-df = pd.read_csv('data/plants_updated_partial.csv')
+df = read_table('data/plants_updated_partial.csv')
 
 # Comprehensive plant database with all species
 comprehensive_data = {
@@ -139,6 +140,6 @@ df = df.fillna('')
 df = df[df['SPECIES'] != '']
 
 # Save the result
-df.to_csv('data/enhanced_species_table_complete.csv', index=False)
+write_table(df, 'data/enhanced_species_table_complete.csv')
 print(f"Processed {len(df)} rows")
 print("Complete enhanced species table saved to data/enhanced_species_table_complete.csv")
\ No newline at end of file
@@ -1,9 +1,10 @@
 #!/usr/bin/env python3
 import pandas as pd
 import numpy as np
+from plant_table_io import read_table, write_table
 
 # Read the processed CSV
-df = pd.read_csv('data/plants_processing.csv')
+df = read_table('data/plants_processing.csv')
 
 # Dictionary to store plant data that we'll fill in manually
 plant_data = {
@@ -493,6 +494,6 @@ for idx, row in df.iterrows():
 df = df[df['SPECIES'].notna() & (df['SPECIES'] != '')]
 
 # Save the updated file
-df.to_csv('data/plants_updated_partial.csv', index=False)
+write_table(df, 'data/plants_updated_partial.csv')
 print(f"Updated {len(df)} rows with partial data")
 print("This is a partial update. More comprehensive data filling needed...")
\ No newline at end of file
@@ -1,9 +1,10 @@
 #!/usr/bin/env python3
 import pandas as pd
 import numpy as np
+from plant_table_io import read_table, write_table
 
 # Read the CSV
-df = pd.read_csv('data/enhanced_species_table_complete_final.csv')
+df = read_table('data/enhanced_species_table_complete_final.csv')
 
 # Final comprehensive plant database for all remaining species
 final_plant_db = {
@@ -344,5 +345,5 @@ for idx, row in df.iterrows():
 df = df[df['SPECIES'].notna() & (df['SPECIES'] != '')]
 
 # Save the final result
-df.to_csv('data/enhanced_species_table_complete_final.csv', index=False)
+write_table(df, 'data/enhanced_species_table_complete_final.csv')
 print(f"Final comprehensive processing complete: {len(df)} rows")
\ No newline at end of file
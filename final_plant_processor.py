@@ -1,9 +1,10 @@
 #!/usr/bin/env python3
 import pandas as pd
 import numpy as np
+from plant_table_io import read_table, write_table
 
 # Read the CSV
-df = pd.read_csv('data/enhanced_species_table_complete.csv')
+df = read_table('data/enhanced_species_table_complete.csv')
 
 # Comprehensive plant database - Part 1 (A-C)
 plant_database = {
@@ -203,5 +204,5 @@ for idx, row in df.iterrows():
                     df.at[idx, df_field] = value
 
 # Save the final result
-df.to_csv('data/enhanced_species_table_final.csv', index=False)
+write_table(df, 'data/enhanced_species_table_final.csv')
 print(f"Processed {len(df)} rows - final comprehensive update complete")
\ No newline at end of file
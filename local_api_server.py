@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the GBIF and Tropicos APIs
+Serves recorded responses from fixtures/ so the enrichment path can be exercised,
+benchmarked and load-tested offline, with configurable latency and fault injection.
+"""
+
+import json
+import random
+import threading
+import time
+import zlib
+import argparse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+DEFAULT_FIXTURES = Path(__file__).parent / "fixtures" / "standin_api_responses.json"
+
+GBIF_PREFIX = "/gbif/v1"
+TROPICOS_PREFIX = "/tropicos"
+
+class FixtureStore:
+    """Recorded API payloads, with optional synthetic answers for unknown names"""
+    
+    def __init__(self, fixtures_file: Path = DEFAULT_FIXTURES, synthesize: bool = True):
+        with open(fixtures_file, 'r') as f:
+            fixtures = json.load(f)
+        
+        self.gbif_match: Dict[str, Dict] = fixtures['gbif']['match']
+        self.gbif_species: Dict[str, Dict] = fixtures['gbif']['species']
+        self.tropicos_search: Dict[str, list] = fixtures['tropicos']['name_search']
+        self.synthesize = synthesize
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def _synthetic_key(name: str) -> int:
+        """Stable usageKey for a name, kept clear of the recorded fixture keys"""
+        return 10_000_000 + zlib.crc32(name.encode()) % 90_000_000
+    
+    def gbif_match_for(self, name: str) -> Dict:
+        if name in self.gbif_match:
+            return self.gbif_match[name]
+        if not self.synthesize:
+            return {"confidence": 100, "matchType": "NONE", "synonym": False}
+        
+        key = self._synthetic_key(name)
+        with self._lock:
+            self.gbif_species.setdefault(str(key), {
+                "key": key,
+                "scientificName": name,
+                "canonicalName": name,
+                "vernacularName": f"Stand-in {name.split()[-1]}",
+                "kingdom": "Plantae",
+                "genus": name.split()[0],
+                "rank": "SPECIES",
+                "taxonomicStatus": "ACCEPTED"
+            })
+        return {"usageKey": key, "scientificName": name, "canonicalName": name,
+                "rank": "SPECIES", "status": "ACCEPTED", "confidence": 95,
+                "matchType": "EXACT", "kingdom": "Plantae"}
+    
+    def gbif_species_for(self, key: str) -> Optional[Dict]:
+        return self.gbif_species.get(key)
+    
+    def tropicos_search_for(self, name: str) -> list:
+        if name in self.tropicos_search:
+            return self.tropicos_search[name]
+        if not self.synthesize:
+            return [{"Error": "No names were found"}]
+        
+        return [{"NameId": self._synthetic_key(name), "ScientificName": name,
+                 "RankAbbreviation": "sp.", "Etymology": f"stand-in etymology of {name.split()[-1]}"}]
+
+class StandInServer(ThreadingHTTPServer):
+    """HTTP server holding the fixtures, fault settings and request counters"""
+    
+    daemon_threads = True
+    
+    def __init__(self, address: Tuple[str, int], fixtures: FixtureStore, latency_ms: float = 0.0,
+                 latency_jitter_ms: float = 0.0, error_rate: float = 0.0, throttle_rate: float = 0.0,
+                 retry_after: int = 1, seed: Optional[int] = None):
+        super().__init__(address, StandInHandler)
+        self.fixtures = fixtures
+        self.latency_ms = latency_ms
+        self.latency_jitter_ms = latency_jitter_ms
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.retry_after = retry_after
+        self.random = random.Random(seed)
+        self.stats = {'requests': 0, 'errors_injected': 0, 'throttled': 0}
+        self.stats_lock = threading.Lock()
+    
+    @property
+    def base_urls(self) -> Dict[str, str]:
+        """Values for the base_urls section of config.json"""
+        host, port = self.server_address[:2]
+        return {
+            'gbif': f"http://{host}:{port}{GBIF_PREFIX}",
+            'tropicos': f"http://{host}:{port}{TROPICOS_PREFIX}"
+        }
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """Routes GBIF /species/match, /species/{key} and Tropicos /Name/Search"""
+    
+    server: StandInServer
+    protocol_version = "HTTP/1.1"  # Keep-alive, like the real APIs
+    disable_nagle_algorithm = True  # Headers and body go out in separate writes
+    
+    def log_message(self, format, *args):
+        pass  # Request logging would dominate load tests
+    
+    def do_GET(self):
+        server = self.server
+        with server.stats_lock:
+            server.stats['requests'] += 1
+            roll = server.random.random()
+            delay = max(0.0, server.random.gauss(server.latency_ms, server.latency_jitter_ms)) / 1000
+        
+        if delay:
+            time.sleep(delay)
+        
+        if roll < server.throttle_rate:
+            with server.stats_lock:
+                server.stats['throttled'] += 1
+            self._send_json(429, {"error": "Too many requests"},
+                            {'Retry-After': str(server.retry_after)})
+            return
+        
+        if roll < server.throttle_rate + server.error_rate:
+            with server.stats_lock:
+                server.stats['errors_injected'] += 1
+            self._send_json(503, {"error": "Injected failure"})
+            return
+        
+        url = urlparse(self.path)
+        params = {key: values[0] for key, values in parse_qs(url.query).items()}
+        fixtures = server.fixtures
+        
+        if url.path == f"{GBIF_PREFIX}/species/match":
+            self._send_json(200, fixtures.gbif_match_for(params.get('name', '')))
+        elif url.path.startswith(f"{GBIF_PREFIX}/species/"):
+            detail = fixtures.gbif_species_for(url.path.rsplit('/', 1)[-1])
+            if detail is None:
+                self._send_json(404, {"error": "Not found"})
+            else:
+                self._send_json(200, detail)
+        elif url.path == f"{TROPICOS_PREFIX}/Name/Search":
+            self._send_json(200, fixtures.tropicos_search_for(params.get('name', '')))
+        else:
+            self._send_json(404, {"error": f"Unknown path {url.path}"})
+    
+    def _send_json(self, status: int, payload, headers: Optional[Dict[str, str]] = None):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+def start_server(host: str = "127.0.0.1", port: int = 0, fixtures_file: Path = DEFAULT_FIXTURES,
+                 synthesize: bool = True, **fault_options) -> StandInServer:
+    """Start the stand-in on a background thread; port 0 picks a free port"""
+    server = StandInServer((host, port), FixtureStore(fixtures_file, synthesize), **fault_options)
+    thread = threading.Thread(target=server.serve_forever, name='standin-api', daemon=True)
+    thread.start()
+    return server
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description="Local stand-in for the GBIF and Tropicos APIs")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8089)
+    parser.add_argument('--fixtures', type=Path, default=DEFAULT_FIXTURES)
+    parser.add_argument('--no-synthesize', dest='synthesize', action='store_false',
+                        help="Answer unknown names with no-match instead of synthetic records")
+    parser.add_argument('--latency-ms', type=float, default=0.0, help="Mean added latency per request")
+    parser.add_argument('--latency-jitter-ms', type=float, default=0.0, help="Standard deviation of the latency")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="Fraction of requests answered with 503")
+    parser.add_argument('--throttle-rate', type=float, default=0.0, help="Fraction of requests answered with 429")
+    parser.add_argument('--retry-after', type=int, default=1, help="Retry-After seconds sent with 429s")
+    parser.add_argument('--seed', type=int, help="Seed for latency and fault injection")
+    args = parser.parse_args()
+    
+    server = StandInServer(
+        (args.host, args.port),
+        FixtureStore(args.fixtures, args.synthesize),
+        latency_ms=args.latency_ms,
+        latency_jitter_ms=args.latency_jitter_ms,
+        error_rate=args.error_rate,
+        throttle_rate=args.throttle_rate,
+        retry_after=args.retry_after,
+        seed=args.seed
+    )
+    
+    print(f"Stand-in API listening on {args.host}:{server.server_address[1]}")
+    print("Point the adapters at it with this config.json entry:")
+    print(json.dumps({'base_urls': server.base_urls}, indent=2))
+    
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+if __name__ == "__main__":
+    main()
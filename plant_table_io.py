@@ -0,0 +1,281 @@
+#!/usr/bin/env python3
+"""
+Shared table I/O for the processing stages
+Tables are always written as CSV and, when pyarrow is installed, also as a typed Arrow IPC
+(or Parquet) file next to it. Readers load the binary file when it is at least as new as the
+CSV, memory-mapped and without parsing text; otherwise they fall back to the CSV.
+"""
+
+import logging
+import os
+from pathlib import Path
+from typing import Collection, Dict, Iterator, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # CSV only
+    pa = None
+    pq = None
+
+logger = logging.getLogger(__name__)
+
+BINARY_SUFFIXES = {'arrow': '.arrow', 'parquet': '.parquet'}
+DEFAULT_BINARY_FORMAT = 'arrow'  # Uncompressed IPC files can be memory-mapped as they are
+
+PathLike = Union[str, Path]
+Vocabularies = Dict[str, Collection[str]]
+
+def binary_path(path: PathLike, binary_format: str = DEFAULT_BINARY_FORMAT) -> Path:
+    """Binary sibling of a CSV path, e.g. data/table.csv -> data/table.arrow"""
+    return Path(path).with_suffix(BINARY_SUFFIXES[binary_format])
+
+def _to_arrow(df: pd.DataFrame) -> 'pa.Table':
+    """Arrow table holding what a CSV round trip would read back
+    
+    Empty strings are stored as nulls, since CSV cannot tell them apart. Object
+    columns mixing strings and numbers are stored as strings. Categoricals are
+    stored as plain values; readers apply their own categories.
+    """
+    df = df.copy(deep=False)
+    for column in df.columns:
+        dtype = df[column].dtype
+        if isinstance(dtype, pd.CategoricalDtype):
+            df[column] = df[column].astype(object)
+        if df[column].dtype == object or pd.api.types.is_string_dtype(dtype):
+            df[column] = df[column].mask(df[column] == '')
+    
+    try:
+        return pa.Table.from_pandas(df, preserve_index=False)
+    except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError):
+        for column in df.columns:
+            if df[column].dtype == object:
+                df[column] = df[column].where(df[column].isna(), df[column].astype(str))
+        return pa.Table.from_pandas(df, preserve_index=False)
+
+def write_table(df: pd.DataFrame, path: PathLike, binary_format: Optional[str] = DEFAULT_BINARY_FORMAT):
+    """Write df as CSV at path, plus a binary copy when pyarrow is available"""
+    df.to_csv(path, index=False)
+    _remove_binaries(path)
+    if not binary_format or pa is None:
+        return
+    
+    target = binary_path(path, binary_format)
+    try:
+        table = _to_arrow(df)
+        if binary_format == 'parquet':
+            pq.write_table(table, target)
+        else:
+            with pa.OSFile(str(target), 'wb') as sink, pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+    except (pa.ArrowException, OSError) as e:
+        logger.warning(f"Could not write {target}, readers will use the CSV: {e}")
+        _remove(target)
+
+def _fresh_binary(path: PathLike) -> Optional[Path]:
+    """The binary sibling of path if pyarrow can read it and it is not older than the CSV"""
+    if pa is None:
+        return None
+    
+    csv_path = Path(path)
+    for binary_format in BINARY_SUFFIXES:
+        candidate = binary_path(csv_path, binary_format)
+        if not candidate.exists():
+            continue
+        if not csv_path.exists() or candidate.stat().st_mtime >= csv_path.stat().st_mtime:
+            return candidate
+    return None
+
+def _read_binary(path: Path, columns: Optional[List[str]] = None) -> 'pa.Table':
+    if path.suffix == BINARY_SUFFIXES['parquet']:
+        return pq.read_table(path, columns=columns, memory_map=True)
+    
+    with pa.memory_map(str(path), 'r') as source:
+        table = pa.ipc.open_file(source).read_all()
+    return table.select(columns) if columns is not None else table
+
+def _skipped_records(rows: np.ndarray) -> Dict:
+    """read_csv arguments that parse only the given data rows (sorted positions)"""
+    if not len(rows):
+        return {'nrows': 0}
+    # skiprows counts records, header included, so quoted newlines do not shift it
+    skipped = np.setdiff1d(np.arange(int(rows[-1]) + 1), rows, assume_unique=True) + 1
+    return {'skiprows': set(skipped.tolist()), 'nrows': len(rows)}
+
+def _as_dtype(df: pd.DataFrame, dtype) -> pd.DataFrame:
+    """df.astype(dtype), keeping missing values missing as read_csv(dtype=...) does
+    
+    Without this, astype(str) turns None and NaN into 'None' and 'nan'.
+    """
+    if dtype is None:
+        return df
+    return df.astype(dtype).where(df.notna())
+
+def _binary_chunks(path: Path, chunksize: int, dtype,
+                   columns: Optional[List[str]] = None) -> Iterator[pd.DataFrame]:
+    """Chunks of a binary file as DataFrames, indexed by row number like read_csv(chunksize=...)
+    
+    Parquet is decoded one batch at a time; IPC files are memory-mapped and sliced.
+    """
+    if path.suffix == BINARY_SUFFIXES['parquet']:
+        batches = pq.ParquetFile(path, memory_map=True).iter_batches(batch_size=chunksize, columns=columns)
+    else:
+        table = _read_binary(path, columns)
+        batches = (table.slice(start, chunksize) for start in range(0, table.num_rows, chunksize))
+    
+    start = 0
+    for batch in batches:
+        chunk = batch.to_pandas()
+        chunk.index = pd.RangeIndex(start, start + len(chunk))
+        start += len(chunk)
+        yield _as_dtype(chunk, dtype)
+
+def as_categorical(df: pd.DataFrame, vocabularies: Vocabularies) -> pd.DataFrame:
+    """Convert the columns of df named in vocabularies to categoricals, in place
+    
+    Categories are the column's known vocabulary followed by any other value found
+    in it, so no value is lost.
+    """
+    for column, vocabulary in vocabularies.items():
+        if column not in df:
+            continue
+        known = sorted(vocabulary)
+        observed = pd.unique(df[column].dropna().to_numpy(dtype=object))
+        extra = sorted(set(observed) - set(known), key=str)
+        df[column] = pd.Categorical(df[column], categories=known + extra)
+    return df
+
+def where_categorical(current: pd.Series, keep: pd.Series, other: pd.Series) -> pd.Series:
+    """current.where(keep, other) that also works on categoricals, adding new values as categories"""
+    if not isinstance(current.dtype, pd.CategoricalDtype):
+        return current.where(keep, other)
+    
+    other = other.where(~keep)
+    new = pd.Index(pd.unique(other.dropna().to_numpy(dtype=object))).difference(current.cat.categories)
+    if len(new):
+        current = current.cat.add_categories(new)
+    return current.where(keep, other)
+
+def read_table(path: PathLike, chunksize: Optional[int] = None, dtype=None,
+               categories: Optional[Vocabularies] = None, columns: Optional[List[str]] = None,
+               rows: Optional[np.ndarray] = None, **csv_kwargs):
+    """Read a table written by write_table, preferring its binary copy
+    
+    Takes the same chunksize and dtype arguments as pd.read_csv. Other read_csv
+    options cannot be applied to the binary file, so they always read the CSV.
+    Columns named in categories are loaded with as_categorical. columns limits the
+    columns read; rows, sorted data row positions, limits the rows parsed (without
+    chunksize) and becomes the index.
+    """
+    source = None if csv_kwargs else _fresh_binary(path)
+    if rows is not None:
+        rows = np.asarray(rows, dtype=np.int64)
+    
+    if source is None:
+        if rows is not None:
+            csv_kwargs.update(_skipped_records(rows))
+        frames = pd.read_csv(path, chunksize=chunksize, dtype=dtype, usecols=columns, **csv_kwargs)
+    elif chunksize:
+        frames = _binary_chunks(source, chunksize, dtype, columns)
+    else:
+        table = _read_binary(source, columns)
+        frames = _as_dtype((table.take(rows) if rows is not None else table).to_pandas(), dtype)
+    
+    if rows is not None and not chunksize:
+        frames.index = pd.Index(rows)
+    
+    if not categories:
+        return frames
+    if chunksize:
+        return (as_categorical(chunk, categories) for chunk in frames)
+    return as_categorical(frames, categories)
+
+class TableWriter:
+    """Writes a table chunk by chunk: CSV appends plus batches of a binary copy
+    
+    The binary file takes its schema from the first chunk, with all-null columns
+    stored as strings. If a later chunk cannot be cast to it, the binary file is
+    dropped and only the CSV is completed.
+    """
+    
+    def __init__(self, path: PathLike, binary_format: Optional[str] = DEFAULT_BINARY_FORMAT):
+        self.path = Path(path)
+        self.binary_format = binary_format if pa is not None else None
+        self.binary_target = binary_path(path, binary_format) if self.binary_format else None
+        self.rows_written = 0
+        self._sink = None
+        self._writer = None
+        self._schema = None
+        _remove_binaries(path)
+    
+    def write(self, df: pd.DataFrame):
+        first = self.rows_written == 0
+        df.to_csv(self.path, mode='w' if first else 'a', header=first, index=False)
+        self.rows_written += len(df)
+        
+        if self.binary_format:
+            try:
+                self._write_binary(df)
+            except (pa.ArrowException, KeyError, OSError) as e:
+                logger.warning(f"Dropping {self.binary_target}, readers will use the CSV: {e}")
+                self._abandon_binary()
+    
+    def _write_binary(self, df: pd.DataFrame):
+        table = _to_arrow(df)
+        if self._writer is None:
+            self._schema = pa.schema([self._chunk_field(field) for field in table.schema],
+                                     metadata=table.schema.metadata)
+            if self.binary_format == 'parquet':
+                self._writer = pq.ParquetWriter(self.binary_target, self._schema)
+            else:
+                self._sink = pa.OSFile(str(self.binary_target), 'wb')
+                self._writer = pa.ipc.new_file(self._sink, self._schema)
+        
+        if not table.schema.equals(self._schema):
+            table = table.select(self._schema.names).cast(self._schema)
+        self._writer.write_table(table)
+    
+    @staticmethod
+    def _chunk_field(field: 'pa.Field') -> 'pa.Field':
+        """Field type that later chunks of the same column can be cast to"""
+        # A column that is empty in the first chunk has no type yet; nothing casts to null
+        if pa.types.is_null(field.type):
+            return field.with_type(pa.string())
+        return field
+    
+    def _close_binary(self):
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+        if self._sink is not None:
+            self._sink.close()
+            self._sink = None
+    
+    def _abandon_binary(self):
+        try:
+            self._close_binary()
+        finally:
+            _remove(self.binary_target)
+            self.binary_format = None
+    
+    def close(self):
+        if self.binary_format:
+            self._close_binary()
+    
+    def __enter__(self) -> 'TableWriter':
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+def _remove(path: Optional[Path]):
+    if path is not None and path.exists():
+        os.remove(path)
+
+def _remove_binaries(path: PathLike):
+    """Drop binary copies of an older version of the table, which readers would otherwise prefer"""
+    for binary_format in BINARY_SUFFIXES:
+        _remove(binary_path(path, binary_format))
@@ -2,9 +2,10 @@
 import pandas as pd
 import re
 import numpy as np
+from plant_table_io import read_table, write_table
 
 # Read the CSV file
-df = pd.read_csv('data/enhanced_species_table.csv')
+df = read_table('data/enhanced_species_table.csv')
 
 # Create new columns
 df['LIFE FORM'] = ''
@@ -196,6 +197,6 @@ column_order = [
 df = df[column_order]
 
 # Save intermediate result
-df.to_csv('data/plants_processing.csv', index=False)
+write_table(df, 'data/plants_processing.csv')
 print(f"Processed {len(df)} rows")
 print("Initial processing complete. Now need to fill missing data...")
\ No newline at end of file
@@ -8,25 +8,111 @@ import pandas as pd
 import numpy as np
 import json
 import requests
+from requests.adapters import HTTPAdapter
 import time
+import random
 import logging
-from typing import Dict, List, Optional, Tuple
+import asyncio
+import argparse
+import threading
+import queue
+import atexit
+from logging.handlers import QueueHandler, QueueListener
+from typing import Callable, ClassVar, Dict, FrozenSet, List, Optional, Set, Tuple
 from datetime import datetime
 from pathlib import Path
+import sqlite3
 import hashlib
+import os
+import zlib
+import multiprocessing
+from email.utils import parsedate_to_datetime
 from dataclasses import dataclass, asdict
 from enum import Enum
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from plant_table_io import (DEFAULT_BINARY_FORMAT, TableWriter, as_categorical, read_table, where_categorical,
+                            write_table)
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('plant_processor.log'),
-        logging.StreamHandler()
-    ]
-)
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+_log_listener: Optional[QueueListener] = None
+
+def configure_logging(log_file: str = 'plant_processor.log', level: int = logging.INFO):
+    """Log to file and stderr through a queue drained by a background thread
+    
+    Callers only enqueue records, so hot loops never wait on disk or console I/O.
+    Like logging.basicConfig, this does nothing if the root logger is already configured.
+    """
+    global _log_listener
+    root = logging.getLogger()
+    if _log_listener is not None or root.handlers:
+        return
+    
+    formatter = logging.Formatter(LOG_FORMAT)
+    handlers = [logging.FileHandler(log_file), logging.StreamHandler()]
+    for handler in handlers:
+        handler.setFormatter(formatter)
+    
+    log_queue = queue.SimpleQueue()
+    root.addHandler(QueueHandler(log_queue))
+    root.setLevel(level)
+    
+    _log_listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _log_listener.start()
+    atexit.register(_log_listener.stop)  # Flushes whatever is still queued
+
+class RepeatedMessageLog:
+    """Counts repeated per-row or per-species messages instead of logging each one
+    
+    The first few occurrences of each category are logged as usual and kept as
+    examples; later ones are only counted. summarize() logs one line per category.
+    """
+    
+    def __init__(self, target: logging.Logger, samples: int = 3):
+        self.logger = target
+        self.samples = samples
+        self._lock = threading.Lock()
+        self._counts: Dict[Tuple[int, str], int] = {}
+        self._examples: Dict[Tuple[int, str], List[str]] = {}
+    
+    def log(self, level: int, category: str, message: str):
+        """Record one occurrence of category; message is logged only while sampling"""
+        key = (level, category)
+        with self._lock:
+            count = self._counts.get(key, 0) + 1
+            self._counts[key] = count
+            if count > self.samples:
+                return
+            self._examples.setdefault(key, []).append(message)
+        self.logger.log(level, message)
+    
+    def log_many(self, level: int, category: str, messages: List[str]):
+        """Record len(messages) occurrences of category at once"""
+        key = (level, category)
+        with self._lock:
+            seen = self._counts.get(key, 0)
+            self._counts[key] = seen + len(messages)
+            sampled = messages[:max(0, self.samples - seen)]
+            self._examples.setdefault(key, []).extend(sampled)
+        for message in sampled:
+            self.logger.log(level, message)
+    
+    def summarize(self):
+        """Log a counted summary of every category seen since the last call, then reset"""
+        with self._lock:
+            counts, examples = self._counts, self._examples
+            self._counts, self._examples = {}, {}
+        
+        for (level, category), count in sorted(counts.items(), key=lambda item: -item[1]):
+            if count <= self.samples:
+                continue  # Every occurrence was already logged
+            shown = '; '.join(examples[(level, category)])
+            self.logger.log(level, f"{category}: {count} occurrences ({self.samples} logged, e.g. {shown})")
+
+configure_logging()
 logger = logging.getLogger(__name__)
+repeated = RepeatedMessageLog(logger)
 
 class DataSource(Enum):
     """Enum for data sources with reliability scores"""
@@ -41,9 +127,35 @@ class DataSource(Enum):
         self.display_name = display_name
         self.reliability = reliability
 
-@dataclass
+# Enrichable PlantData fields and the table columns they fill
+FIELD_COLUMNS = {
+    'literal_latin': 'LITERAL LATIN',
+    'common_name': 'COMMON NAME',
+    'life_form': 'LIFE FORM',
+    'specific_location': 'SPECIFIC LOCATION',
+    'general_location': 'GENERAL LOCATION',
+    'hemisphere': 'HEMISPHERE',
+    'source': 'SOURCE'
+}
+
+# Lookup plan: for every input frame, the canonical species of each valid row, indexed by row
+LookupPlan = List[pd.Series]
+
+# Provenance is packed into one int per record: SOURCE_BITS bits per field of FIELD_COLUMNS,
+# each holding the DataSource's position plus one (0 = no source)
+SOURCES = tuple(DataSource)
+SOURCE_BITS = 4
+SOURCE_MASK = (1 << SOURCE_BITS) - 1
+FIELD_SHIFTS = {field: i * SOURCE_BITS for i, field in enumerate(FIELD_COLUMNS)}
+
+@dataclass(slots=True)
 class PlantData:
-    """Data class for plant information with source tracking"""
+    """Data class for plant information with source tracking
+    
+    Slotted, with sources int-coded in source_codes; data_sources decodes them.
+    transient_failures has a bit per SOURCES position whose lookup failed transiently.
+    Records carry no timestamp of their own: last_updated is the run's timestamp.
+    """
     species: str
     literal_latin: Optional[str] = None
     common_name: Optional[str] = None
@@ -52,15 +164,93 @@ class PlantData:
     general_location: Optional[str] = None
     hemisphere: Optional[str] = None
     source: Optional[str] = None
-    data_sources: Dict[str, str] = None
+    source_codes: int = 0
     confidence_score: float = 0.0
-    last_updated: str = None
+    transient_failures: int = 0
+    
+    run_timestamp: ClassVar[Optional[str]] = None  # Set by the processor when a run starts
+    
+    def set_source(self, field: str, data_source: DataSource):
+        """Record which source supplied a field"""
+        shift = FIELD_SHIFTS[field]
+        code = SOURCES.index(data_source) + 1
+        self.source_codes = self.source_codes & ~(SOURCE_MASK << shift) | code << shift
+    
+    def get_source(self, field: str) -> Optional[DataSource]:
+        code = self.source_codes >> FIELD_SHIFTS[field] & SOURCE_MASK
+        return SOURCES[code - 1] if code else None
+    
+    def add_transient_failure(self, data_source: DataSource):
+        """Record that a source could not be reached, so the lookup is worth retrying"""
+        self.transient_failures |= 1 << SOURCES.index(data_source)
+    
+    @property
+    def failed_sources(self) -> List[str]:
+        """Display names of the sources that failed transiently"""
+        return [source.display_name for i, source in enumerate(SOURCES) if self.transient_failures >> i & 1]
     
-    def __post_init__(self):
-        if self.data_sources is None:
-            self.data_sources = {}
-        if self.last_updated is None:
-            self.last_updated = datetime.now().isoformat()
+    @property
+    def data_sources(self) -> Dict[str, str]:
+        """Field -> source display name, most reliable source first, as merges add them"""
+        sources = [(field, self.get_source(field)) for field in FIELD_COLUMNS]
+        sources = sorted(((field, source) for field, source in sources if source),
+                         key=lambda item: (-item[1].reliability, SOURCES.index(item[1])))
+        return {field: source.display_name for field, source in sources}
+    
+    @property
+    def last_updated(self) -> Optional[str]:
+        return PlantData.run_timestamp
+    
+    @classmethod
+    def from_record(cls, record: Dict) -> 'PlantData':
+        """Rebuild a record written with asdict(), including ones with a data_sources dict"""
+        record = dict(record)
+        record.pop('last_updated', None)
+        data_sources = record.pop('data_sources', None) or {}
+        
+        plant_data = cls(**record)
+        for field, name in data_sources.items():
+            plant_data.set_source(field, SOURCES[SOURCE_INDEX.get(name, MANUAL_SOURCE_INDEX)])
+        return plant_data
+
+# Weight of each PlantData field in the confidence score
+CONFIDENCE_WEIGHTS = {
+    'species': 0.2,
+    'literal_latin': 0.1,
+    'common_name': 0.15,
+    'life_form': 0.15,
+    'specific_location': 0.1,
+    'general_location': 0.1,
+    'hemisphere': 0.1,
+    'source': 0.1
+}
+
+# DataSource lookup tables for vectorized scoring; unknown names count as manual entries
+SOURCE_INDEX = {data_source.display_name: i for i, data_source in enumerate(DataSource)}
+SOURCE_RELIABILITY = np.array([data_source.reliability for data_source in DataSource])
+MANUAL_SOURCE_INDEX = SOURCE_INDEX[DataSource.MANUAL.display_name]
+
+def score_confidence(presence: np.ndarray, source_index: np.ndarray, weights: np.ndarray) -> np.ndarray:
+    """Confidence scores for many records in one pass
+    
+    presence is a (records, fields) boolean matrix, source_index a matching matrix of
+    positions in DataSource, and weights one weight per field. The sum is accumulated
+    field by field and rounded like round(score, 2), so results match the per-record
+    calculation exactly.
+    """
+    reliability = SOURCE_RELIABILITY[source_index]
+    score = np.zeros(presence.shape[0])
+    for j, weight in enumerate(weights):
+        score += np.where(presence[:, j], weight * reliability[:, j], 0.0)
+    
+    # np.round works on score * 100, which can land on the wrong side of a .xx5 tie;
+    # resolve those few values with Python's correctly rounded round()
+    scaled = score * 100
+    rounded = np.round(scaled) / 100
+    near_tie = np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6
+    if near_tie.any():
+        rounded[near_tie] = [round(value, 2) for value in score[near_tie].tolist()]
+    return rounded
 
 class PlantDataValidator:
     """Validates plant data for consistency and accuracy"""
@@ -75,6 +265,14 @@ class PlantDataValidator:
     
     VALID_SOURCES = {'natural', 'bred', 'hybrid', 'cultivar'}
     
+    # Regexes for the batch species checks. They only accept ASCII, where they agree
+    # exactly with the single-value functions; anything else falls back to those.
+    # Single-spaced printable words, which normalize by lowercasing and capitalizing
+    PLAIN_SPECIES_PATTERN = r'[!-~]+(?: [!-~]+)*'
+    # Capitalized genus and an epithet with a lowercase letter and no uppercase one
+    WELL_FORMED_SPECIES_PATTERN = (r'[\t-\r\x1c-\x1f ]*[A-Z][!-~]*[\t-\r\x1c-\x1f ]+'
+                                   r'[!-@\[-~]*[a-z][!-@\[-~]*(?:[\t-\r\x1c-\x1f ]|$)')
+    
     @staticmethod
     def validate_life_form(life_form: str) -> Tuple[bool, str]:
         """Validate life form against Raunkiær system"""
@@ -111,6 +309,16 @@ class PlantDataValidator:
         
         return False, f"Invalid source: {source}. Must be one of {PlantDataValidator.VALID_SOURCES}"
     
+    @staticmethod
+    def normalize_species_name(species_raw: str) -> str:
+        """Properly capitalize a species name (Genus species)"""
+        species_raw = species_raw.strip()
+        species_parts = species_raw.lower().split()
+        if len(species_parts) >= 2:
+            # Capitalize genus, keep species epithet lowercase
+            return species_parts[0].capitalize() + ' ' + ' '.join(species_parts[1:])
+        return species_raw
+    
     @staticmethod
     def validate_species_name(species: str) -> Tuple[bool, str]:
         """Validate scientific name format"""
@@ -130,47 +338,797 @@ class PlantDataValidator:
             return False, f"Species epithet must be lowercase: {species}"
         
         return True, ""
+    
+    @staticmethod
+    def _distinct(values: pd.Series) -> Tuple[np.ndarray, np.ndarray]:
+        """(codes, distinct values) of a column as strings, with missing values as ''
+        
+        Batch checks run once per distinct value and are broadcast back with take().
+        """
+        text = values.astype(object).where(values.notna(), '')
+        codes, uniques = pd.factorize(text.to_numpy(dtype=object))
+        return codes, np.array([value if isinstance(value, str) else str(value) for value in uniques],
+                               dtype=object)
+    
+    @staticmethod
+    def _broadcast(index: pd.Index, codes: np.ndarray, is_valid: np.ndarray,
+                   reasons: np.ndarray) -> Tuple[pd.Series, pd.Series]:
+        return (pd.Series(is_valid.take(codes), index=index),
+                pd.Series(reasons.take(codes), index=index, dtype=object))
+    
+    @staticmethod
+    def _native_text(uniques: np.ndarray) -> Optional[pd.Series]:
+        """Distinct values as a pyarrow-backed string Series, or None without pyarrow
+        
+        pandas only runs str methods natively on pyarrow strings; on Python objects
+        they are slower than a plain loop.
+        """
+        text = pd.Series(uniques, dtype='str')
+        return text if getattr(text.dtype, 'storage', None) == 'pyarrow' else None
+    
+    @staticmethod
+    def normalize_species_names(species_raw: pd.Series) -> pd.Series:
+        """normalize_species_name for a whole column; missing values become ''"""
+        codes, uniques = PlantDataValidator._distinct(species_raw)
+        text = PlantDataValidator._native_text(uniques)
+        normalized = uniques.copy()
+        
+        # Plain names are normalized with vectorized string methods, the rest one by one
+        if text is None:
+            plain = np.zeros(len(uniques), dtype=bool)
+        else:
+            plain = text.str.fullmatch(PlantDataValidator.PLAIN_SPECIES_PATTERN).to_numpy(dtype=bool)
+            binomial = plain & text.str.contains(' ', regex=False).to_numpy(dtype=bool)
+            normalized[binomial] = text[binomial].str.capitalize().to_numpy(dtype=object)
+        for i in np.flatnonzero(~plain):
+            normalized[i] = PlantDataValidator.normalize_species_name(uniques[i])
+        return pd.Series(normalized.take(codes), index=species_raw.index, dtype=object)
+    
+    @staticmethod
+    def _validate_allowed(values: pd.Series, allowed: Set[str], label: str) -> Tuple[pd.Series, pd.Series]:
+        codes, uniques = PlantDataValidator._distinct(values)
+        is_valid = np.array([not value or value.strip().lower() in allowed for value in uniques], dtype=bool)
+        
+        reasons = np.full(len(uniques), '', dtype=object)
+        for i in np.flatnonzero(~is_valid):
+            reasons[i] = f"Invalid {label}: {uniques[i]}. Must be one of {allowed}"
+        return PlantDataValidator._broadcast(values.index, codes, is_valid, reasons)
+    
+    @staticmethod
+    def _validate_species_names(species: pd.Series) -> Tuple[pd.Series, pd.Series]:
+        codes, uniques = PlantDataValidator._distinct(species)
+        
+        # Cheap check first (a vectorized regex, or a loop without pyarrow); only values
+        # it does not accept go through validate_species_name, for their message or a
+        # non-ASCII name
+        def well_formed(value: str) -> bool:
+            parts = value.split(None, 2)
+            return len(parts) >= 2 and parts[0][0].isupper() and parts[1].islower()
+        
+        text = PlantDataValidator._native_text(uniques)
+        if text is None:
+            is_valid = np.array([well_formed(value) for value in uniques], dtype=bool)
+        else:
+            well_formed_text = text.str.match(PlantDataValidator.WELL_FORMED_SPECIES_PATTERN)
+            is_valid = well_formed_text.to_numpy(dtype=bool, copy=True)
+        reasons = np.full(len(uniques), '', dtype=object)
+        for i in np.flatnonzero(~is_valid):
+            is_valid[i], reasons[i] = PlantDataValidator.validate_species_name(uniques[i])
+        return PlantDataValidator._broadcast(species.index, codes, is_valid, reasons)
+    
+    @staticmethod
+    def validate_batch(species: Optional[pd.Series] = None, life_form: Optional[pd.Series] = None,
+                       hemisphere: Optional[pd.Series] = None,
+                       source: Optional[pd.Series] = None) -> Dict[str, Tuple[pd.Series, pd.Series]]:
+        """Validate whole columns at once, checking each distinct value a single time
+        
+        Returns {name: (is_valid, reasons)} for each column given: a boolean mask and
+        the message the single-value validator would give ('' where valid).
+        Species names are checked as given, so normalize them first.
+        """
+        results = {}
+        if species is not None:
+            results['species'] = PlantDataValidator._validate_species_names(species)
+        if life_form is not None:
+            results['life_form'] = PlantDataValidator._validate_allowed(
+                life_form, PlantDataValidator.VALID_LIFE_FORMS, 'life form')
+        if hemisphere is not None:
+            results['hemisphere'] = PlantDataValidator._validate_allowed(
+                hemisphere, PlantDataValidator.VALID_HEMISPHERES, 'hemisphere')
+        if source is not None:
+            results['source'] = PlantDataValidator._validate_allowed(
+                source, PlantDataValidator.VALID_SOURCES, 'source')
+        return results
+
+# Enumerated columns, loaded as categoricals. Categories are the validator's vocabulary
+# where it has one, plus whatever other values a table holds.
+CATEGORY_VOCABULARIES = {
+    'LIFE FORM': PlantDataValidator.VALID_LIFE_FORMS,
+    'HEMISPHERE': PlantDataValidator.VALID_HEMISPHERES,
+    'SOURCE': PlantDataValidator.VALID_SOURCES,
+    'GROWTH FORM': frozenset(),
+    'GROWTH HABIT': frozenset(),
+    'HORTICULTURAL DEVELOPMENT': frozenset(),
+    'COMMERCIAL STATUS': frozenset(),
+    'CONSERVATION STATUS': frozenset(),
+    'FAMILY': frozenset(),
+    'ORDER': frozenset()
+}
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header given either as seconds or as an HTTP date"""
+    if not value:
+        return None
+    
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, retry_at.timestamp() - time.time())
+
+class TokenBucket:
+    """Adaptive token bucket for one data source
+    
+    With a state_path the bucket state lives in a small SQLite table, so every
+    process using the same file and bucket name draws from one shared budget.
+    A 429 halves the refill rate and pauses the bucket for Retry-After seconds;
+    each success then recovers the rate gradually toward its configured maximum.
+    """
+    
+    RECOVERY_STEP = 0.05  # Fraction of the maximum rate regained per success
+    
+    def __init__(self, name: str, rate: float, burst: float = 1.0,
+                 state_path: Optional[str] = None, min_rate: Optional[float] = None):
+        self.name = name
+        self.max_rate = max(rate, 1e-6)
+        self.min_rate = min_rate if min_rate is not None else self.max_rate / 16
+        self.burst = max(burst, 1.0)
+        self.state_path = Path(state_path) if state_path else None
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._state = self._initial_state()
+        self._degraded = False
+        
+        if self.state_path:
+            self.state_path.parent.mkdir(parents=True, exist_ok=True)
+            self._connect().execute("""
+                CREATE TABLE IF NOT EXISTS rate_buckets (
+                    name TEXT PRIMARY KEY,
+                    tokens REAL NOT NULL,
+                    rate REAL NOT NULL,
+                    updated_at REAL NOT NULL,
+                    blocked_until REAL NOT NULL
+                )
+            """)
+    
+    def _initial_state(self) -> Dict[str, float]:
+        return {'tokens': self.burst, 'rate': self.max_rate, 'updated_at': time.time(), 'blocked_until': 0.0}
+    
+    def _connect(self) -> sqlite3.Connection:
+        """Return this thread's connection to the shared state file"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(str(self.state_path), timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+    
+    def _update(self, change):
+        """Apply change(state) atomically to the bucket state and return its result"""
+        if self.state_path is None:
+            with self._lock:
+                return change(self._state)
+        
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute(
+                "SELECT tokens, rate, updated_at, blocked_until FROM rate_buckets WHERE name = ?",
+                (self.name,)
+            ).fetchone()
+            if row:
+                state = dict(zip(('tokens', 'rate', 'updated_at', 'blocked_until'), row))
+            else:
+                state = self._initial_state()
+            
+            result = change(state)
+            
+            conn.execute(
+                "INSERT OR REPLACE INTO rate_buckets (name, tokens, rate, updated_at, blocked_until) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (self.name, state['tokens'], state['rate'], state['updated_at'], state['blocked_until'])
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return result
+    
+    def _take(self, state: Dict[str, float]) -> float:
+        """Take one token if available; otherwise return how long to wait"""
+        now = time.time()
+        rate = min(state['rate'], self.max_rate)
+        state['rate'] = rate
+        self._degraded = rate < self.max_rate
+        
+        # Leave the tokens alone during a pause, so refilling starts when it ends
+        if now < state['blocked_until']:
+            return state['blocked_until'] - now
+        
+        state['tokens'] = min(self.burst, state['tokens'] + max(0.0, now - state['updated_at']) * rate)
+        state['updated_at'] = now
+        
+        if state['tokens'] >= 1:
+            state['tokens'] -= 1
+            return 0.0
+        return (1 - state['tokens']) / rate
+    
+    def acquire(self):
+        """Block until a request to this source is within budget"""
+        while True:
+            wait = self._update(self._take)
+            if wait <= 0:
+                return
+            time.sleep(wait)
+    
+    def on_throttled(self, retry_after: Optional[float] = None):
+        """Back off after a 429: halve the rate and pause for Retry-After seconds"""
+        def change(state):
+            now = time.time()
+            state['rate'] = max(self.min_rate, state['rate'] / 2)
+            pause = retry_after if retry_after is not None else 1 / state['rate']
+            state['blocked_until'] = max(state['blocked_until'], now + pause)
+            # No tokens accrue while the source is asking us to wait
+            state['tokens'] = 0.0
+            state['updated_at'] = state['blocked_until']
+            return state['rate']
+        
+        rate = self._update(change)
+        self._degraded = True
+        repeated.log(logging.WARNING, f"Rate limited by {self.name}",
+                     f"Rate limited by {self.name}; slowing to {rate:.2f} requests/s")
+    
+    def on_success(self):
+        """Recover the rate gradually after a previous backoff"""
+        if not self._degraded:
+            return
+        
+        def change(state):
+            state['rate'] = min(self.max_rate, state['rate'] + self.max_rate * self.RECOVERY_STEP)
+            return state['rate']
+        
+        self._degraded = self._update(change) < self.max_rate
+
+class CacheStore:
+    """Single-file SQLite cache shared by all adapters, with TTL expiry and LRU size cap
+    
+    The database runs in WAL mode with a busy timeout, so several threads and
+    processes can read and write the same cache file at once.
+    """
+    
+    EVICTION_INTERVAL = 100  # Check the size cap every N writes
+    TOUCH_INTERVAL = 3600  # Only rewrite accessed_at on reads once it is this many seconds old
+    
+    def __init__(self, path: str, expiry_days: float = 7, max_bytes: int = 512 * 1024 * 1024):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_age = expiry_days * 86400
+        self.max_bytes = max_bytes
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._writes = 0
+        
+        conn = self._connect()
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS cache_entries (
+                namespace TEXT NOT NULL,
+                key TEXT NOT NULL,
+                data TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL,
+                PRIMARY KEY (namespace, key)
+            )
+        """)
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_cache_accessed ON cache_entries (accessed_at)")
+    
+    def _connect(self) -> sqlite3.Connection:
+        """Return this thread's connection, opening it on first use"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(str(self.path), timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+    
+    def get(self, namespace: str, key: str) -> Optional[Dict]:
+        """Return the cached payload if present and fresh, refreshing its LRU position"""
+        entry = self.get_entry(namespace, key)
+        return entry[0] if entry else None
+    
+    def get_entry(self, namespace: str, key: str) -> Optional[Tuple[Dict, float]]:
+        """Like get, but also return the entry's creation time
+        
+        The LRU position is refreshed at most once per TOUCH_INTERVAL, so hot entries
+        do not cost a write on every read.
+        """
+        conn = self._connect()
+        row = conn.execute(
+            "SELECT data, created_at, accessed_at FROM cache_entries WHERE namespace = ? AND key = ?",
+            (namespace, key)
+        ).fetchone()
+        
+        if row is None:
+            return None
+        
+        now = time.time()
+        if now - row[1] >= self.max_age:
+            return None
+        
+        if now - row[2] >= self.TOUCH_INTERVAL:
+            conn.execute(
+                "UPDATE cache_entries SET accessed_at = ? WHERE namespace = ? AND key = ?",
+                (now, namespace, key)
+            )
+        return json.loads(row[0]), row[1]
+    
+    def set(self, namespace: str, key: str, data: Dict):
+        """Store a payload, evicting least recently used entries when over the size cap"""
+        payload = json.dumps(data)
+        now = time.time()
+        
+        self._connect().execute(
+            "INSERT OR REPLACE INTO cache_entries (namespace, key, data, size, created_at, accessed_at) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (namespace, key, payload, len(payload), now, now)
+        )
+        
+        with self._lock:
+            self._writes += 1
+            due = self._writes % self.EVICTION_INTERVAL == 0
+        if due:
+            self.evict()
+    
+    def evict(self):
+        """Drop expired entries, then least recently used ones until under the size cap"""
+        conn = self._connect()
+        conn.execute("DELETE FROM cache_entries WHERE created_at <= ?", (time.time() - self.max_age,))
+        
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM cache_entries").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        
+        # Keep the most recently used entries whose running size fits in the cap
+        conn.execute("""
+            DELETE FROM cache_entries WHERE rowid IN (
+                SELECT rowid FROM (
+                    SELECT rowid, SUM(size) OVER (ORDER BY accessed_at DESC, rowid DESC) AS running
+                    FROM cache_entries
+                ) WHERE running > ?
+            )
+        """, (self.max_bytes,))
+        logger.info(f"Evicted cache entries to stay under {self.max_bytes} bytes")
+
+def build_http_session(pool_size: int = 10) -> requests.Session:
+    """Create a keep-alive session with a connection pool
+    
+    The session does not retry on its own; DataSourceAdapter._get retries transient
+    errors so that every attempt is rate limited and shows up in the metrics.
+    """
+    http_adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=0)
+    
+    session = requests.Session()
+    session.mount('https://', http_adapter)
+    session.mount('http://', http_adapter)
+    return session
+
+class MetricsRegistry:
+    """Thread-safe counters and histograms, rendered in the Prometheus text format"""
+    
+    LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+    
+    # name -> (type, help)
+    METRICS = {
+        'plant_adapter_requests_total': ('counter', "HTTP requests sent to each source, by status"),
+        'plant_adapter_request_duration_seconds': ('histogram', "HTTP request latency per source"),
+        'plant_adapter_errors_total': ('counter', "Failed HTTP requests per source, by error type"),
+        'plant_adapter_response_bytes_total': ('counter', "Response body bytes received per source"),
+        'plant_cache_lookups_total': ('counter', "Adapter cache lookups, by tier and result"),
+        'plant_adapter_fetch_duration_seconds': ('histogram', "Per-adapter species lookup time, cache included"),
+        'plant_adapter_fetches_total': ('counter', "Per-adapter species lookups, by outcome"),
+        'plant_species_lookup_duration_seconds': ('histogram', "Time to aggregate one species from all sources")
+    }
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters: Dict[str, Dict[Tuple[Tuple[str, str], ...], float]] = {}
+        self._histograms: Dict[str, Dict[Tuple[Tuple[str, str], ...], List]] = {}
+    
+    @staticmethod
+    def _key(labels: Dict[str, str]) -> Tuple[Tuple[str, str], ...]:
+        return tuple(sorted(labels.items()))
+    
+    def inc(self, name: str, labels: Dict[str, str], amount: float = 1):
+        key = self._key(labels)
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + amount
+    
+    def observe(self, name: str, labels: Dict[str, str], value: float):
+        key = self._key(labels)
+        with self._lock:
+            # [per-bucket counts, sum, count]
+            state = self._histograms.setdefault(name, {}).setdefault(
+                key, [[0] * len(self.LATENCY_BUCKETS), 0.0, 0])
+            for i, bound in enumerate(self.LATENCY_BUCKETS):
+                if value <= bound:
+                    state[0][i] += 1
+                    break
+            state[1] += value
+            state[2] += 1
+    
+    def __getstate__(self) -> Dict:
+        # Worker processes send their registries back to the parent; locks cannot be pickled
+        with self._lock:
+            return {'_counters': self._counters, '_histograms': self._histograms}
+    
+    def __setstate__(self, state: Dict):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+    
+    def merge(self, other: 'MetricsRegistry'):
+        """Add every counter and histogram of another registry to this one"""
+        with self._lock:
+            for name, series in other._counters.items():
+                counters = self._counters.setdefault(name, {})
+                for key, value in series.items():
+                    counters[key] = counters.get(key, 0) + value
+            
+            for name, series in other._histograms.items():
+                histograms = self._histograms.setdefault(name, {})
+                for key, (buckets, total, count) in series.items():
+                    state = histograms.setdefault(key, [[0] * len(self.LATENCY_BUCKETS), 0.0, 0])
+                    state[0] = [mine + theirs for mine, theirs in zip(state[0], buckets)]
+                    state[1] += total
+                    state[2] += count
+    
+    def counter_value(self, name: str, **labels) -> float:
+        """Sum of a counter over every series matching the given labels"""
+        with self._lock:
+            return sum(value for key, value in self._counters.get(name, {}).items()
+                       if all(item in key for item in labels.items()))
+    
+    def histogram_totals(self, name: str, **labels) -> Tuple[float, int]:
+        """(sum, count) of a histogram over every series matching the given labels"""
+        total, count = 0.0, 0
+        with self._lock:
+            for key, state in self._histograms.get(name, {}).items():
+                if all(item in key for item in labels.items()):
+                    total += state[1]
+                    count += state[2]
+        return total, count
+    
+    @staticmethod
+    def _format_labels(key: Tuple[Tuple[str, str], ...], extra: Tuple[Tuple[str, str], ...] = ()) -> str:
+        items = key + extra
+        if not items:
+            return ""
+        escaped = (str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+                   for _, value in items)
+        return "{" + ",".join(f'{name}="{value}"' for (name, _), value in zip(items, escaped)) + "}"
+    
+    @staticmethod
+    def _format_value(value: float) -> str:
+        """Exact sample value: integers in full, other floats round-trippable"""
+        if float(value).is_integer():
+            return str(int(value))
+        return repr(float(value))
+    
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format"""
+        lines = []
+        with self._lock:
+            for name, (kind, help_text) in self.METRICS.items():
+                series = self._counters.get(name) if kind == 'counter' else self._histograms.get(name)
+                if not series:
+                    continue
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} {kind}")
+                
+                for key in sorted(series):
+                    if kind == 'counter':
+                        lines.append(f"{name}{self._format_labels(key)} {self._format_value(series[key])}")
+                        continue
+                    
+                    buckets, total, count = series[key]
+                    cumulative = 0
+                    for bound, bucket_count in zip(self.LATENCY_BUCKETS, buckets):
+                        cumulative += bucket_count
+                        lines.append(f"{name}_bucket{self._format_labels(key, (('le', f'{bound:g}'),))} {cumulative}")
+                    lines.append(f"{name}_bucket{self._format_labels(key, (('le', '+Inf'),))} {count}")
+                    lines.append(f"{name}_sum{self._format_labels(key)} {self._format_value(total)}")
+                    lines.append(f"{name}_count{self._format_labels(key)} {count}")
+        return "\n".join(lines) + "\n"
+    
+    def write(self, path: str):
+        """Write the metrics file atomically, as the node_exporter textfile collector expects"""
+        target = Path(path)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        temp = target.with_name(target.name + '.tmp')
+        with open(temp, 'w') as f:
+            f.write(self.render())
+        os.replace(temp, target)
+
+class LookupFailure(Enum):
+    """Why a source lookup produced no data"""
+    NO_MATCH = "no_match"  # Source does not know the name, or rejected or garbled the request
+    TRANSIENT_ERROR = "transient_error"  # Timeouts, connection errors, 429, 5xx
+    AUTH_ERROR = "auth_error"  # Missing or rejected API key; applies to the whole source
 
 class DataSourceAdapter:
     """Base class for data source adapters"""
     
-    def __init__(self, api_key: Optional[str] = None):
+    SOURCE: DataSource = DataSource.MANUAL  # Set by each concrete adapter
+    PROVIDES: FrozenSet[str] = frozenset(FIELD_COLUMNS)  # PlantData fields the adapter can fill
+    BASE_URL = ""
+    RETRY_STATUSES: FrozenSet[int] = frozenset({500, 502, 503, 504})
+    MEMORY_MISS_SECONDS = 60  # How long the memory tier remembers that disk had no entry
+    
+    # How long each kind of failed lookup is remembered before retrying
+    DEFAULT_NEGATIVE_CACHE_HOURS = {
+        LookupFailure.NO_MATCH.value: 72,
+        LookupFailure.AUTH_ERROR.value: 1,
+        LookupFailure.TRANSIENT_ERROR.value: 0
+    }
+    
+    def __init__(self, api_key: Optional[str] = None, rate_limiter: Optional[TokenBucket] = None,
+                 cache_store: Optional[CacheStore] = None, memory_cache_size: int = 10000,
+                 negative_cache_hours: Optional[Dict[str, float]] = None,
+                 session: Optional[requests.Session] = None, timeout: Tuple[float, float] = (10, 30),
+                 max_throttle_retries: int = 3, max_retries: int = 3, retry_backoff: float = 0.5,
+                 retry_jitter: float = 0.5, base_url: Optional[str] = None,
+                 metrics: Optional[MetricsRegistry] = None):
         self.api_key = api_key
-        self.session = requests.Session()
-        self.cache_dir = Path("cache")
-        self.cache_dir.mkdir(exist_ok=True)
+        self.negative_cache_hours = {**self.DEFAULT_NEGATIVE_CACHE_HOURS, **(negative_cache_hours or {})}
+        self.rate_limiter = rate_limiter
+        self.session = session or build_http_session()
+        self.timeout = timeout  # (connect, read) seconds
+        self.max_throttle_retries = max_throttle_retries
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self.retry_jitter = retry_jitter
+        self.base_url = (base_url or self.BASE_URL).rstrip('/')
+        self.cache_store = cache_store or CacheStore(Path("cache") / "adapter_cache.sqlite3")
+        self.metrics = metrics or MetricsRegistry()
+        self.source_label = self.SOURCE.name.lower()
+        
+        # In-process LRU of parsed responses and recent disk misses (stored as None),
+        # checked before the on-disk store
+        self.memory_cache_size = memory_cache_size
+        self._memory_cache: OrderedDict = OrderedDict()
+        self._memory_lock = threading.Lock()
+        self.memory_hits = 0
+        self.memory_misses = 0
+        self.disk_hits = 0
+        self.disk_misses = 0
+        
+        # Why the current lookup on each thread came back empty; see take_failure
+        self._lookup_state = threading.local()
     
-    def get_cache_key(self, query: str) -> str:
-        """Generate cache key for query"""
-        return hashlib.md5(f"{self.__class__.__name__}:{query}".encode()).hexdigest()
+    def _throttle(self):
+        """Wait for this source's rate budget before hitting the network"""
+        if self.rate_limiter:
+            self.rate_limiter.acquire()
     
-    def get_cached_data(self, query: str) -> Optional[Dict]:
-        """Get cached data if available and fresh"""
-        cache_file = self.cache_dir / f"{self.get_cache_key(query)}.json"
+    def _get(self, url: str, params: Optional[Dict] = None) -> requests.Response:
+        """Rate-limited GET with connect/read timeouts; raises for error statuses
         
-        if cache_file.exists():
-            with open(cache_file, 'r') as f:
-                cache_data = json.load(f)
+        Connection errors, timeouts and 5xx responses are retried up to max_retries times
+        with exponential backoff (retry_backoff * 2**n seconds) plus random jitter.
+        A 429 response slows this source's token bucket, honoring Retry-After,
+        and the request is retried up to max_throttle_retries times.
+        Every attempt is recorded in the metrics.
+        """
+        retries = throttles = 0
+        while True:
+            self._throttle()
+            started = time.perf_counter()
+            try:
+                response = self.session.get(url, params=params, timeout=self.timeout)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                self._record_request(started, error=e)
+                if retries >= self.max_retries:
+                    raise
+                retries += 1
+                self._backoff(retries)
+                continue
+            except requests.RequestException as e:
+                self._record_request(started, error=e)
+                raise
+            self._record_request(started, response)
             
-            # Check if cache is less than 7 days old
-            cache_time = datetime.fromisoformat(cache_data['timestamp'])
-            if (datetime.now() - cache_time).days < 7:
-                return cache_data['data']
+            if response.status_code == 429 and throttles < self.max_throttle_retries:
+                throttles += 1
+                if self.rate_limiter:
+                    self.rate_limiter.on_throttled(parse_retry_after(response.headers.get('Retry-After')))
+            elif response.status_code in self.RETRY_STATUSES and retries < self.max_retries:
+                retries += 1
+                self._backoff(retries)
+            else:
+                break
         
-        return None
+        response.raise_for_status()
+        if self.rate_limiter:
+            self.rate_limiter.on_success()
+        return response
+    
+    def _backoff(self, attempt: int):
+        """Sleep before retrying a transient error"""
+        time.sleep(self.retry_backoff * 2 ** (attempt - 1) + random.uniform(0, self.retry_jitter))
+    
+    def _record_request(self, started: float, response: Optional[requests.Response] = None,
+                        error: Optional[Exception] = None):
+        """Record latency, status, size and error type of one HTTP request"""
+        source = {'source': self.source_label}
+        self.metrics.observe('plant_adapter_request_duration_seconds', source, time.perf_counter() - started)
+        
+        if response is None:
+            self.metrics.inc('plant_adapter_requests_total', {**source, 'status': 'error'})
+            self.metrics.inc('plant_adapter_errors_total', {**source, 'type': type(error).__name__})
+            return
+        
+        self.metrics.inc('plant_adapter_requests_total', {**source, 'status': str(response.status_code)})
+        self.metrics.inc('plant_adapter_response_bytes_total', source, len(response.content))
+        if response.status_code >= 400:
+            self.metrics.inc('plant_adapter_errors_total', {**source, 'type': f"http_{response.status_code}"})
+    
+    def _record_cache_lookup(self, kind: Optional[str], tier: str, hit: bool):
+        self.metrics.inc('plant_cache_lookups_total', {
+            'source': self.source_label,
+            'kind': kind or 'data',
+            'tier': tier,
+            'result': 'hit' if hit else 'miss'
+        })
+    
+    def _namespace(self, kind: Optional[str] = None) -> str:
+        """Cache namespace for this adapter, optionally narrowed to one kind of entry"""
+        name = self.__class__.__name__
+        return f"{name}:{kind}" if kind else name
+    
+    def get_cached_data(self, query: str, kind: Optional[str] = None) -> Optional[Dict]:
+        """Get cached data if available and fresh, trying memory before disk
+        
+        Disk misses are remembered in memory for MEMORY_MISS_SECONDS, so names that
+        never resolve do not query SQLite on every lookup.
+        """
+        namespace = self._namespace(kind)
+        memory_key = (namespace, query)
+        
+        with self._memory_lock:
+            entry = self._memory_cache.get(memory_key)
+            if entry is not None:
+                data, expires_at = entry
+                if time.time() < expires_at:
+                    self._memory_cache.move_to_end(memory_key)
+                    self.memory_hits += 1
+                    self._record_cache_lookup(kind, 'memory', True)
+                    return data
+                del self._memory_cache[memory_key]
+            self.memory_misses += 1
+        self._record_cache_lookup(kind, 'memory', False)
+        
+        stored = self.cache_store.get_entry(namespace, query)
+        self._record_cache_lookup(kind, 'disk', stored is not None)
+        if stored is None:
+            with self._memory_lock:
+                self.disk_misses += 1
+            self._remember(memory_key, None, time.time() + self.MEMORY_MISS_SECONDS)
+            return None
+        
+        with self._memory_lock:
+            self.disk_hits += 1
+        
+        data, created_at = stored
+        self._remember(memory_key, data, created_at + self.cache_store.max_age)
+        return data
     
-    def save_to_cache(self, query: str, data: Dict):
+    def save_to_cache(self, query: str, data: Dict, kind: Optional[str] = None):
         """Save data to cache"""
-        cache_file = self.cache_dir / f"{self.get_cache_key(query)}.json"
+        namespace = self._namespace(kind)
+        self.cache_store.set(namespace, query, data)
+        self._remember((namespace, query), data, time.time() + self.cache_store.max_age)
+    
+    def get_negative_result(self, query: str) -> Optional[LookupFailure]:
+        """Return the cached failure for a query, or a rejected key for the whole source,
+        if it is still within its own TTL
+        """
+        for key in (self._auth_query(), query):
+            cached = self.get_cached_data(key, kind='negative')
+            if not cached:
+                continue
+            
+            failure = LookupFailure(cached['failure'])
+            ttl_hours = self.negative_cache_hours.get(failure.value, 0)
+            if time.time() - cached['timestamp'] < ttl_hours * 3600:
+                return failure
+        return None
+    
+    def save_negative_result(self, query: str, failure: LookupFailure, reason: str = ""):
+        """Remember a failed lookup; failures with a zero TTL are always retried
         
-        cache_data = {
-            'timestamp': datetime.now().isoformat(),
-            'query': query,
-            'data': data
-        }
+        An auth error is remembered once for the source and API key rather than per query.
+        The failure is also reported to the caller of this thread's lookup through take_failure.
+        """
+        self._lookup_state.failure = failure
+        if self.negative_cache_hours.get(failure.value, 0) <= 0:
+            return
+        
+        if failure is LookupFailure.AUTH_ERROR:
+            query = self._auth_query()
+        self.save_to_cache(query, {
+            'failure': failure.value,
+            'reason': reason,
+            'timestamp': time.time()
+        }, kind='negative')
+    
+    def take_failure(self) -> Optional[LookupFailure]:
+        """Failure of the last lookup made on this thread, if any; cleared once read"""
+        failure = getattr(self._lookup_state, 'failure', None)
+        self._lookup_state.failure = None
+        return failure
+    
+    def _auth_query(self) -> str:
+        """Cache key of a rejected API key, so a new key is tried at once"""
+        key_hash = hashlib.sha1((self.api_key or '').encode()).hexdigest()[:12]
+        return f"*auth:{key_hash}"
+    
+    @staticmethod
+    def classify_error(error: Exception) -> LookupFailure:
+        """Map a lookup exception to the kind of failure it represents
+        
+        Only failures that a later attempt can fix are transient: timeouts, connection
+        errors, 429 and 5xx. Other 4xx responses and unreadable bodies count as no match.
+        """
+        response = getattr(error, 'response', None)
+        if response is not None:
+            if response.status_code in (401, 403):
+                return LookupFailure.AUTH_ERROR
+            if response.status_code == 429 or response.status_code >= 500:
+                return LookupFailure.TRANSIENT_ERROR
+            return LookupFailure.NO_MATCH
+        if isinstance(error, (requests.Timeout, requests.ConnectionError, requests.exceptions.ChunkedEncodingError)):
+            return LookupFailure.TRANSIENT_ERROR
+        return LookupFailure.NO_MATCH
+    
+    def _remember(self, memory_key: Tuple[str, str], data: Optional[Dict], expires_at: float):
+        """Put a parsed response (or None for a disk miss) in the memory tier, evicting the
+        least recently used
+        """
+        if self.memory_cache_size <= 0:
+            return
         
-        with open(cache_file, 'w') as f:
-            json.dump(cache_data, f)
+        with self._memory_lock:
+            self._memory_cache[memory_key] = (data, expires_at)
+            self._memory_cache.move_to_end(memory_key)
+            while len(self._memory_cache) > self.memory_cache_size:
+                self._memory_cache.popitem(last=False)
+    
+    def cache_stats(self) -> Dict[str, int]:
+        """Hit and miss counters for the memory and disk cache tiers"""
+        with self._memory_lock:
+            return {
+                'memory_hits': self.memory_hits,
+                'memory_misses': self.memory_misses,
+                'memory_entries': len(self._memory_cache),
+                'disk_hits': self.disk_hits,
+                'disk_misses': self.disk_misses
+            }
     
     def fetch_plant_data(self, species: str) -> Optional[PlantData]:
         """Fetch plant data from source - to be implemented by subclasses"""
@@ -179,55 +1137,75 @@ class DataSourceAdapter:
 class GBIFAdapter(DataSourceAdapter):
     """Adapter for GBIF (Global Biodiversity Information Facility) API"""
     
+    SOURCE = DataSource.GBIF
+    PROVIDES = frozenset({'common_name'})
     BASE_URL = "https://api.gbif.org/v1"
     
     def fetch_plant_data(self, species: str) -> Optional[PlantData]:
-        """Fetch plant data from GBIF"""
+        """Fetch plant data from GBIF
+        
+        Lookups are cached in two levels, name -> usageKey and usageKey -> detail,
+        so synonyms and spelling variants of one taxon share a single detail record.
+        """
         # Check cache first
-        cached = self.get_cached_data(species)
-        if cached:
-            logger.info(f"Using cached GBIF data for {species}")
-            return self._parse_gbif_response(cached, species)
+        match = self.get_cached_data(species, kind='match')
+        if match is None:
+            failure = self.get_negative_result(species)
+            if failure:
+                repeated.log(logging.INFO, f"Skipped GBIF lookups (cached {failure.value})",
+                             f"Skipping GBIF lookup for {species}: cached {failure.value}")
+                return None
         
         try:
-            # Search for species
-            search_url = f"{self.BASE_URL}/species/match"
-            params = {"name": species, "kingdom": "Plantae"}
-            
-            response = self.session.get(search_url, params=params)
-            response.raise_for_status()
-            
-            data = response.json()
-            
-            if data.get('matchType') == 'NONE':
-                logger.warning(f"No GBIF match found for {species}")
-                return None
-            
-            # Get detailed species info
-            species_key = data.get('usageKey')
-            if species_key:
-                detail_url = f"{self.BASE_URL}/species/{species_key}"
-                detail_response = self.session.get(detail_url)
-                detail_response.raise_for_status()
+            if match is None:
+                # Search for species
+                search_url = f"{self.base_url}/species/match"
+                params = {"name": species, "kingdom": "Plantae"}
                 
-                detailed_data = detail_response.json()
+                response = self._get(search_url, params=params)
                 
-                # Cache the response
-                self.save_to_cache(species, detailed_data)
+                data = response.json()
                 
-                return self._parse_gbif_response(detailed_data, species)
+                species_key = data.get('usageKey')
+                if data.get('matchType') == 'NONE' or not species_key:
+                    repeated.log(logging.WARNING, "No GBIF match found", f"No GBIF match found for {species}")
+                    self.save_negative_result(species, LookupFailure.NO_MATCH)
+                    return None
                 
+                match = {'usageKey': species_key, 'matchType': data.get('matchType')}
+                self.save_to_cache(species, match, kind='match')
+            
+            # Get detailed species info
+            species_key = str(match['usageKey'])
+            detailed_data = self.get_cached_data(species_key, kind='detail')
+            if detailed_data:
+                repeated.log(logging.INFO, "Used cached GBIF data",
+                             f"Using cached GBIF data for {species} (usageKey {species_key})")
+                return self._parse_gbif_response(detailed_data, species)
+            
+            detail_url = f"{self.base_url}/species/{species_key}"
+            detail_response = self._get(detail_url)
+            
+            detailed_data = detail_response.json()
+            
+            # Cache the response
+            self.save_to_cache(species_key, detailed_data, kind='detail')
+            
+            return self._parse_gbif_response(detailed_data, species)
+        
         except Exception as e:
-            logger.error(f"Error fetching GBIF data for {species}: {e}")
+            repeated.log(logging.ERROR, f"Error fetching GBIF data ({type(e).__name__})",
+                         f"Error fetching GBIF data for {species}: {e}")
+            self.save_negative_result(species, self.classify_error(e), str(e))
             return None
     
     def _parse_gbif_response(self, data: Dict, species: str) -> PlantData:
         """Parse GBIF response into PlantData"""
         plant_data = PlantData(
             species=species,
-            common_name=data.get('vernacularName'),
-            data_sources={'common_name': DataSource.GBIF.display_name}
+            common_name=data.get('vernacularName')
         )
+        plant_data.set_source('common_name', DataSource.GBIF)
         
         # Try to determine hemisphere from distribution data
         if 'distributions' in data:
@@ -239,23 +1217,31 @@ class GBIFAdapter(DataSourceAdapter):
 class TropicosAdapter(DataSourceAdapter):
     """Adapter for Tropicos (Missouri Botanical Garden) API"""
     
+    SOURCE = DataSource.TROPICOS
+    PROVIDES = frozenset({'literal_latin'})
     BASE_URL = "https://services.tropicos.org"
     
     def fetch_plant_data(self, species: str) -> Optional[PlantData]:
         """Fetch plant data from Tropicos"""
         if not self.api_key:
-            logger.warning("Tropicos API key not configured")
+            repeated.log(logging.WARNING, "Tropicos API key not configured", "Tropicos API key not configured")
             return None
         
         # Check cache first
         cached = self.get_cached_data(species)
         if cached:
-            logger.info(f"Using cached Tropicos data for {species}")
+            repeated.log(logging.INFO, "Used cached Tropicos data", f"Using cached Tropicos data for {species}")
             return self._parse_tropicos_response(cached, species)
         
+        failure = self.get_negative_result(species)
+        if failure:
+            repeated.log(logging.INFO, f"Skipped Tropicos lookups (cached {failure.value})",
+                         f"Skipping Tropicos lookup for {species}: cached {failure.value}")
+            return None
+        
         try:
             # Search for name
-            search_url = f"{self.BASE_URL}/Name/Search"
+            search_url = f"{self.base_url}/Name/Search"
             params = {
                 "name": species,
                 "type": "exact",
@@ -263,36 +1249,207 @@ class TropicosAdapter(DataSourceAdapter):
                 "format": "json"
             }
             
-            response = self.session.get(search_url, params=params)
-            response.raise_for_status()
+            response = self._get(search_url, params=params)
             
             data = response.json()
             
-            if data:
-                # Cache the response
-                self.save_to_cache(species, data[0])
-                return self._parse_tropicos_response(data[0], species)
-                
+            # Tropicos reports unknown names as a single {"Error": ...} record
+            if not data or 'Error' in data[0]:
+                repeated.log(logging.WARNING, "No Tropicos match found", f"No Tropicos match found for {species}")
+                self.save_negative_result(species, LookupFailure.NO_MATCH)
+                return None
+            
+            # Cache the response
+            self.save_to_cache(species, data[0])
+            return self._parse_tropicos_response(data[0], species)
+        
         except Exception as e:
-            logger.error(f"Error fetching Tropicos data for {species}: {e}")
+            repeated.log(logging.ERROR, f"Error fetching Tropicos data ({type(e).__name__})",
+                         f"Error fetching Tropicos data for {species}: {e}")
+            self.save_negative_result(species, self.classify_error(e), str(e))
             return None
     
     def _parse_tropicos_response(self, data: Dict, species: str) -> PlantData:
         """Parse Tropicos response into PlantData"""
-        return PlantData(
+        plant_data = PlantData(
             species=species,
-            literal_latin=data.get('Etymology'),
-            data_sources={'literal_latin': DataSource.TROPICOS.display_name}
+            literal_latin=data.get('Etymology')
         )
+        plant_data.set_source('literal_latin', DataSource.TROPICOS)
+        return plant_data
+
+class QualityReport:
+    """Data quality report built in a single pass over the data
+    
+    update() can be called once with a whole table or repeatedly with chunks;
+    counts are merged, so the result does not depend on how the data was split.
+    """
+    
+    EXCLUDED_COLUMNS = {'DATA_SOURCES', 'CONFIDENCE_SCORE', 'DATA_QUALITY_SCORE', 'LAST_UPDATED'}
+    CONFIDENCE_BINS = np.linspace(0.0, 1.0, 11)
+    
+    # Column -> PlantDataValidator.validate_batch argument
+    VALIDATED_COLUMNS = {
+        'SPECIES': 'species',
+        'LIFE FORM': 'life_form',
+        'HEMISPHERE': 'hemisphere',
+        'SOURCE': 'source'
+    }
+    
+    def __init__(self):
+        self.total_records = 0
+        self.non_empty: Dict[str, int] = {}
+        self.confidence_sum = 0.0
+        self.confidence_count = 0
+        self.confidence_histogram = np.zeros(len(self.CONFIDENCE_BINS) - 1, dtype=np.int64)
+        self.source_field_counts: Dict[str, Dict[str, int]] = {}
+        self.validation_failures: Dict[str, Dict[str, int]] = {}
+    
+    def update(self, df: pd.DataFrame):
+        """Fold one table or chunk into the report"""
+        self.total_records += len(df)
+        
+        # Completeness of every column from a single frame-wide comparison
+        non_empty = (df.notna() & df.ne('')).sum()
+        for column, count in non_empty.items():
+            if column not in self.EXCLUDED_COLUMNS:
+                self.non_empty[column] = self.non_empty.get(column, 0) + int(count)
+        
+        if 'DATA_QUALITY_SCORE' in df:
+            scores = pd.to_numeric(df['DATA_QUALITY_SCORE'], errors='coerce').dropna().to_numpy()
+            self.confidence_sum += float(scores.sum())
+            self.confidence_count += len(scores)
+            self.confidence_histogram += np.histogram(np.clip(scores, 0.0, 1.0), bins=self.CONFIDENCE_BINS)[0]
+        
+        # DATA_SOURCES repeats heavily, so each distinct JSON payload is parsed once
+        if 'DATA_SOURCES' in df:
+            for payload, count in df['DATA_SOURCES'].dropna().value_counts().items():
+                try:
+                    sources = json.loads(payload)
+                except (TypeError, ValueError):
+                    continue
+                for field, source in sources.items():
+                    fields = self.source_field_counts.setdefault(source, {})
+                    fields[field] = fields.get(field, 0) + int(count)
+        
+        columns = {argument: column for column, argument in self.VALIDATED_COLUMNS.items() if column in df}
+        batch = {argument: df[column] for argument, column in columns.items()}
+        if 'species' in batch:
+            batch['species'] = PlantDataValidator.normalize_species_names(batch['species'])
+        
+        for argument, (is_valid, error_msgs) in PlantDataValidator.validate_batch(**batch).items():
+            counts = error_msgs[~is_valid].str.split(':').str[0].value_counts()
+            for reason, count in counts.items():
+                reasons = self.validation_failures.setdefault(columns[argument], {})
+                reasons[reason] = reasons.get(reason, 0) + int(count)
+    
+    def to_dict(self) -> Dict:
+        total = self.total_records
+        return {
+            'timestamp': datetime.now().isoformat(),
+            'total_records': total,
+            'fields_completeness': {
+                column: f"{(count / total * 100 if total else 0.0):.1f}%"
+                for column, count in self.non_empty.items()
+            },
+            'average_confidence': self.confidence_sum / self.confidence_count if self.confidence_count else 0,
+            'unscored_records': total - self.confidence_count,
+            'confidence_histogram': {
+                f"{low:.1f}-{high:.1f}": int(count)
+                for low, high, count in zip(self.CONFIDENCE_BINS[:-1], self.CONFIDENCE_BINS[1:],
+                                            self.confidence_histogram)
+            },
+            'data_source_distribution': self.source_field_counts,
+            'validation_failures': self.validation_failures
+        }
+
+class ResultJournal:
+    """Append-only JSONL log of resolved species, used to resume interrupted runs
+    
+    Each aggregated PlantData is written and flushed as soon as it is ready, so a
+    crash loses at most the record being written; a torn last line is ignored
+    when the journal is loaded.
+    """
+    
+    def __init__(self, path: str):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._file = None
+    
+    def load(self) -> Dict[str, PlantData]:
+        """Read every complete record from an existing journal"""
+        results = {}
+        if not self.path.exists():
+            return results
+        
+        with open(self.path, 'r') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                results[record['species']] = PlantData.from_record(record)
+        
+        return results
+    
+    def open(self, append: bool = False):
+        """Start writing, keeping existing records when resuming"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.path, 'a' if append else 'w')
+    
+    def append(self, plant_data: PlantData):
+        """Write one resolved species and flush it to the OS
+        
+        Species with a transient source failure are left out, so a resumed run looks them up again.
+        """
+        if plant_data.transient_failures:
+            return
+        line = json.dumps(asdict(plant_data)) + '\n'
+        with self._lock:
+            self._file.write(line)
+            self._file.flush()
+    
+    def close(self):
+        if self._file:
+            self._file.close()
+            self._file = None
+    
+    def discard(self):
+        """Remove the journal once its results are safely in the output files"""
+        self.close()
+        if self.path.exists():
+            os.remove(self.path)
 
 class ReliablePlantProcessor:
     """Main processor class that aggregates data from multiple sources"""
     
+    PROGRESS_LOG_INTERVAL = 5.0  # Seconds between progress lines during lookups
+    
     def __init__(self, config_file: str = "config.json"):
+        self.config_file = config_file
         self.config = self._load_config(config_file)
         self.validator = PlantDataValidator()
+        self.cache_store = CacheStore(
+            Path(self.config['cache_dir']) / "adapter_cache.sqlite3",
+            expiry_days=self.config['cache_expiry_days'],
+            max_bytes=int(self.config['cache_max_mb'] * 1024 * 1024)
+        )
+        self.metrics = MetricsRegistry()
         self.adapters = self._initialize_adapters()
         self.processed_data: List[PlantData] = []
+        
+        self._last_progress_log = 0.0
+        
+        # One thread per in-flight species in async mode; the default asyncio executor
+        # would cap max_concurrency at min(32, CPU count + 4)
+        concurrency = max(1, int(self.config['max_concurrency']))
+        self._species_pool = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix='species')
+        
+        # Every adapter lookup for every in-flight species can run at once
+        self._adapter_pool = ThreadPoolExecutor(
+            max_workers=len(self.adapters) * concurrency or 1,
+            thread_name_prefix='adapter'
+        )
     
     def _load_config(self, config_file: str) -> Dict:
         """Load configuration from file or use defaults"""
@@ -303,8 +1460,20 @@ class ReliablePlantProcessor:
                 "eol": ""
             },
             "timeout": 30,
+            "connect_timeout": 10,
             "max_retries": 3,
-            "rate_limit_delay": 1.0
+            "retry_backoff": 0.5,
+            "rate_limit_delay": 1.0,
+            "rate_limits": {},
+            "base_urls": {},
+            "max_concurrency": 8,
+            "cache_dir": "cache",
+            "cache_expiry_days": 7,
+            "cache_max_mb": 512,
+            "memory_cache_size": 10000,
+            "negative_cache_hours": dict(DataSourceAdapter.DEFAULT_NEGATIVE_CACHE_HOURS),
+            "metrics_file": "plant_processor_metrics.prom",
+            "binary_format": DEFAULT_BINARY_FORMAT
         }
         
         config_path = Path(config_file)
@@ -322,191 +1491,692 @@ class ReliablePlantProcessor:
     
     def _initialize_adapters(self) -> List[DataSourceAdapter]:
         """Initialize data source adapters"""
+        shared = {
+            'cache_store': self.cache_store,
+            'memory_cache_size': self.config['memory_cache_size'],
+            'negative_cache_hours': self.config['negative_cache_hours'],
+            'timeout': (self.config['connect_timeout'], self.config['timeout']),
+            'max_throttle_retries': self.config['max_retries'],
+            'max_retries': self.config['max_retries'],
+            'retry_backoff': self.config['retry_backoff'],
+            'metrics': self.metrics
+        }
+        tropicos_key = self.config['api_keys'].get('tropicos')
         adapters = [
-            GBIFAdapter(),
-            TropicosAdapter(api_key=self.config['api_keys'].get('tropicos'))
+            GBIFAdapter(session=self._build_session(),
+                        rate_limiter=self._build_rate_limiter(DataSource.GBIF),
+                        base_url=self.config['base_urls'].get('gbif'), **shared),
+            TropicosAdapter(api_key=tropicos_key, session=self._build_session(),
+                            rate_limiter=self._build_rate_limiter(DataSource.TROPICOS, tropicos_key),
+                            base_url=self.config['base_urls'].get('tropicos'), **shared)
         ]
         return adapters
     
+    def _build_session(self) -> requests.Session:
+        """Pooled HTTP session sized for the configured concurrency"""
+        return build_http_session(pool_size=max(1, int(self.config['max_concurrency'])))
+    
+    def _build_rate_limiter(self, source: DataSource, api_key: Optional[str] = None) -> TokenBucket:
+        """Token bucket for one source, shared with other processes using the same API key"""
+        source_key = source.name.lower()
+        limits = self.config['rate_limits'].get(source_key, {})
+        rate = limits.get('requests_per_second', 1 / max(self.config['rate_limit_delay'], 1e-6))
+        
+        name = source_key
+        if api_key:
+            name += ':' + hashlib.sha1(api_key.encode()).hexdigest()[:12]
+        
+        return TokenBucket(
+            name,
+            rate=rate,
+            burst=limits.get('burst', 1),
+            state_path=str(Path(self.config['cache_dir']) / "rate_limits.sqlite3")
+        )
+    
     def process_csv(self, input_file: str, output_file: str):
         """Process CSV file with plant species"""
-        logger.info(f"Processing {input_file}")
+        self.process_csv_files([(input_file, output_file)])
+    
+    async def process_csv_async(self, input_file: str, output_file: str):
+        """Process CSV file resolving many species concurrently through a bounded worker pool"""
+        await self.process_csv_files_async([(input_file, output_file)])
+    
+    def process_csv_streaming(self, input_file: str, output_file: str, chunk_size: int = 50000,
+                              result_cache_size: int = 100000, use_async: bool = False):
+        """Process a CSV in chunks, appending each enriched chunk to the output
         
-        # Read input CSV
-        df = pd.read_csv(input_file)
+        Memory is bounded by chunk_size rows plus an LRU of result_cache_size resolved
+        species, and one small bitmask per unique species from a first scan. That scan
+        makes every lookup ask for the fields all rows of the species need, so the output
+        matches process_csv byte for byte.
+        """
+        timestamp = self._begin_run()
+        available = frozenset().union(*(adapter.PROVIDES for adapter in self.adapters))
+        missing = self._scan_missing_fields(input_file, chunk_size)
+        logger.info(f"Streaming {input_file} in chunks of {chunk_size} rows; "
+                    f"{len(missing)} unique species")
         
-        # Process each species
-        for idx, row in df.iterrows():
-            species_raw = str(row['SPECIES']).strip()
-            
-            if not species_raw or species_raw.lower() == 'nan':
-                continue
-            
-            # Properly capitalize species name (Genus species)
-            species_parts = species_raw.lower().split()
-            if len(species_parts) >= 2:
-                # Capitalize genus, keep species epithet lowercase
-                species = species_parts[0].capitalize() + ' ' + ' '.join(species_parts[1:])
+        results: OrderedDict = OrderedDict()
+        report = QualityReport()
+        with TableWriter(output_file, self.config['binary_format']) as writer:
+            for chunk_no, chunk in enumerate(self._read_csv(input_file, chunksize=chunk_size)):
+                species = self._valid_species(chunk)
+                
+                chunk_results: Dict[str, PlantData] = {}
+                pending: Dict[str, Set[str]] = {}
+                for name in pd.unique(species.to_numpy()):
+                    if name in results:
+                        results.move_to_end(name)
+                        chunk_results[name] = results[name]
+                        continue
+                    fields = self._mask_fields(missing.get(name, 0)) & available
+                    if fields:
+                        pending[name] = fields
+                
+                if use_async:
+                    resolved = asyncio.run(self._aggregate_many_async(list(pending), fields_by_species=pending))
+                else:
+                    resolved = [self._aggregate_plant_data(name, fields, score=False) for name, fields in pending.items()]
+                for record, confidence in zip(resolved, self._score_records(resolved).tolist()):
+                    record.confidence_score = confidence
+                    chunk_results[record.species] = results[record.species] = record
+                while len(results) > result_cache_size:
+                    results.popitem(last=False)
+                
+                self._apply_results(chunk, species[species.isin(chunk_results)], chunk_results)
+                self._add_metadata(chunk, timestamp)
+                writer.write(chunk)
+                report.update(chunk)
+                logger.info(f"Chunk {chunk_no + 1}: wrote {writer.rows_written} rows, {len(pending)} new lookups")
+        
+        logger.info(f"Saved processed data to {output_file}")
+        self._save_quality_report(report, 'data_quality_report.json')
+        self._export_metrics()
+        repeated.summarize()
+    
+    def _scan_missing_fields(self, input_file: str, chunk_size: int) -> Dict[str, int]:
+        """Missing-field bitmask of every species, OR-ed over all of its rows in the file"""
+        masks: Dict[str, int] = {}
+        
+        for chunk in self._read_csv(input_file, chunksize=chunk_size):
+            species = self._valid_species(chunk, warn=False)
+            row_masks = self._empty_field_masks(chunk)[chunk.index.get_indexer(species.index)]
+            names, combined = self._combine_masks(species.to_numpy(dtype=object), row_masks)
+            for name, mask in zip(names.tolist(), combined.tolist()):
+                masks[name] = masks.get(name, 0) | mask
+        
+        return masks
+    
+    def process_csv_files(self, jobs: List[Tuple[str, str]], resume: bool = False,
+                          journal_file: Optional[str] = None):
+        """Process several (input, output) CSV pairs, looking up each unique species only once
+        
+        Every resolved species is appended to a journal as soon as it is ready; with
+        resume=True, species already in the journal are not looked up again.
+        """
+        frames, plan, journal, results, pending = self._start_run(jobs, resume, journal_file)
+        
+        try:
+            self._resolve_pending(pending, results, journal)
+        finally:
+            journal.close()
+        
+        self._write_outputs(jobs, frames, plan, results)
+        journal.discard()
+        self._export_metrics()
+        repeated.summarize()
+    
+    async def process_csv_files_async(self, jobs: List[Tuple[str, str]], resume: bool = False,
+                                      journal_file: Optional[str] = None):
+        """Async variant of process_csv_files"""
+        logger.info(f"Resolving species asynchronously (max_concurrency={self.config['max_concurrency']})")
+        
+        frames, plan, journal, results, pending = self._start_run(jobs, resume, journal_file)
+        
+        try:
+            aggregated = await self._aggregate_many_async(list(pending), on_result=journal.append,
+                                                          fields_by_species=pending)
+        finally:
+            journal.close()
+        results.update(zip(pending, aggregated))
+        
+        self._write_outputs(jobs, frames, plan, results)
+        journal.discard()
+        self._export_metrics()
+        repeated.summarize()
+    
+    def process_csv_files_sharded(self, jobs: List[Tuple[str, str]], workers: int, resume: bool = False,
+                                  journal_file: Optional[str] = None, use_async: bool = False):
+        """process_csv_files spread over a pool of worker processes
+        
+        Rows are sharded by a hash of their genus, so all rows of a species are enriched
+        by the same worker and each species is still looked up once. Every worker runs
+        its own processor from the same config, sharing the SQLite cache and rate-limit
+        state, and journals to its own file. This process reads only the SPECIES column
+        to route rows; each worker then parses just its own rows, so the full parse,
+        validation, lookups and scoring are split between the workers. Merging the shards
+        back into the original row order, the quality reports and writing the outputs
+        still happen in this process.
+        """
+        timestamp = self._begin_run()
+        journal_path = Path(journal_file or self._default_journal_path(jobs))
+        journal_files = [str(journal_path.with_suffix(f'.shard{shard}.jsonl')) for shard in range(workers)]
+        shard_ids = [self._shard_ids(self._read_csv(input_file, columns=['SPECIES']), workers)
+                     for input_file, _ in jobs]
+        logger.info(f"Sharding {sum(len(ids) for ids in shard_ids)} rows by genus "
+                    f"across {workers} worker processes")
+        
+        context = multiprocessing.get_context('spawn')
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+            futures = [
+                pool.submit(_process_shard, self.config_file, jobs,
+                            [np.flatnonzero(ids == shard) for ids in shard_ids],
+                            journal_files[shard], resume, use_async, timestamp)
+                for shard in range(workers)
+            ]
+            shards = [future.result() for future in futures]
+        
+        merged = []
+        for frame_no in range(len(jobs)):
+            df = pd.concat([shard_frames[frame_no] for shard_frames, _ in shards]).sort_index()
+            merged.append(as_categorical(df, CATEGORY_VOCABULARIES))  # Shards have their own categories
+        for _, metrics in shards:
+            self.metrics.merge(metrics)
+        
+        self._save_outputs(jobs, merged)
+        for path in journal_files:
+            ResultJournal(path).discard()
+        self._export_metrics()
+        repeated.summarize()
+    
+    def _shard_ids(self, df: pd.DataFrame, workers: int) -> np.ndarray:
+        """Worker number of every row, from a stable hash of its canonical genus"""
+        species = self.validator.normalize_species_names(df['SPECIES'])
+        codes, genera = pd.factorize(species.str.split(n=1).str[0].fillna(''))
+        shard_of_genus = np.array([zlib.crc32(genus.encode()) % workers for genus in genera], dtype=np.int64)
+        return shard_of_genus.take(codes)
+    
+    def _enrich_shard(self, jobs: List[Tuple[str, str]], rows: List[np.ndarray], journal_file: str,
+                      resume: bool, use_async: bool) -> List[pd.DataFrame]:
+        """Worker side of process_csv_files_sharded: read, resolve and fill one shard of every table"""
+        frames = self._load_inputs(jobs, rows)
+        plan, journal, results, pending = self._plan_run(frames, resume, journal_file)
+        
+        try:
+            if use_async:
+                aggregated = asyncio.run(self._aggregate_many_async(list(pending), on_result=journal.append,
+                                                                    fields_by_species=pending))
+                results.update(zip(pending, aggregated))
             else:
-                species = species_raw
-            
-            # Validate species name
-            is_valid, error_msg = self.validator.validate_species_name(species)
-            if not is_valid:
-                logger.warning(f"Row {idx}: {error_msg}")
-                continue
-            
-            logger.info(f"Processing {species} ({idx + 1}/{len(df)})")
-            
-            # Aggregate data from all sources
-            aggregated_data = self._aggregate_plant_data(species)
-            
-            # Update DataFrame with aggregated data
-            self._update_dataframe_row(df, idx, aggregated_data)
-            
-            # Rate limiting
-            time.sleep(self.config['rate_limit_delay'])
+                self._resolve_pending(pending, results, journal)
+        finally:
+            journal.close()
+        
+        self._fill_frames(frames, plan, results)
+        return frames
+    
+    def _resolve_pending(self, pending: Dict[str, Set[str]], results: Dict[str, PlantData],
+                         journal: 'ResultJournal'):
+        """Look up pending species one at a time, journaling each result"""
+        for position, (species, fields) in enumerate(pending.items()):
+            # Aggregate data from the sources that can fill this species' missing fields
+            results[species] = self._aggregate_plant_data(species, fields, score=False)
+            journal.append(results[species])
+            self._log_progress(position + 1, len(pending))
+    
+    def _start_run(self, jobs: List[Tuple[str, str]], resume: bool, journal_file: Optional[str]):
+        """Load inputs, plan lookups and open the journal, reloading it when resuming"""
+        self._begin_run()
+        frames = self._load_inputs(jobs)
+        return (frames,) + self._plan_run(frames, resume, journal_file or self._default_journal_path(jobs))
+    
+    def _plan_run(self, frames: List[pd.DataFrame], resume: bool, journal_file: str):
+        """Plan lookups for loaded tables and open the journal, reloading it when resuming"""
+        plan = self._plan_lookups(frames)
+        
+        journal = ResultJournal(journal_file)
+        results = journal.load() if resume else {}
+        if resume:
+            logger.info(f"Resuming from {journal.path}: {len(results)} species already resolved")
+        
+        pending = {species: fields for species, fields in self._needed_lookups(frames, plan).items()
+                   if species not in results}
+        logger.info(f"{len(pending)} of {len(self._planned_species(plan))} species need a lookup; "
+                    f"the rest are complete or already resolved")
+        
+        journal.open(append=resume)
+        return plan, journal, results, pending
+    
+    @staticmethod
+    def _begin_run() -> str:
+        """Start the timestamp shared by every record and output row of this run"""
+        PlantData.run_timestamp = datetime.now().isoformat()
+        return PlantData.run_timestamp
+    
+    @staticmethod
+    def _default_journal_path(jobs: List[Tuple[str, str]]) -> str:
+        """Journal next to the first output file"""
+        return str(Path(jobs[0][1]).with_suffix('.journal.jsonl'))
+    
+    @staticmethod
+    def _read_csv(input_file: str, **kwargs):
+        """Read an input table with every column as text, and enumerated columns as categoricals
         
-        # Add metadata columns
-        df['DATA_QUALITY_SCORE'] = df.apply(self._calculate_quality_score, axis=1)
-        df['LAST_UPDATED'] = datetime.now().isoformat()
+        Per-file or per-chunk dtype inference would let one table be written back
+        differently depending on how it was read (1 vs 1.0); text keeps values as given.
+        A fresh binary copy from plant_table_io is read instead of the CSV when present.
+        """
+        return read_table(input_file, dtype=str, categories=CATEGORY_VOCABULARIES, **kwargs)
+    
+    def _load_inputs(self, jobs: List[Tuple[str, str]],
+                     rows: Optional[List[np.ndarray]] = None) -> List[pd.DataFrame]:
+        """Read every input CSV, or only the given row positions of each"""
+        frames = []
+        for job_no, (input_file, _) in enumerate(jobs):
+            logger.info(f"Processing {input_file}")
+            frames.append(self._read_csv(input_file, rows=rows[job_no] if rows is not None else None))
+        return frames
+    
+    def _plan_lookups(self, frames: List[pd.DataFrame]) -> LookupPlan:
+        """Canonical species name of every valid row, one Series per frame indexed by row"""
+        plan = [self._valid_species(df) for df in frames]
+        
+        logger.info(f"Planned {len(self._planned_species(plan))} unique species lookups for "
+                    f"{sum(len(species) for species in plan)} rows across {len(frames)} file(s)")
+        return plan
+    
+    @staticmethod
+    def _planned_species(plan: LookupPlan) -> np.ndarray:
+        """Unique species of a plan, in order of first appearance"""
+        if not plan:
+            return np.array([], dtype=object)
+        return pd.unique(np.concatenate([species.to_numpy(dtype=object) for species in plan]))
+    
+    def _needed_lookups(self, frames: List[pd.DataFrame], plan: LookupPlan) -> Dict[str, Set[str]]:
+        """Fields to look up per species: only those its rows miss and some adapter can supply"""
+        available = frozenset().union(*(adapter.PROVIDES for adapter in self.adapters))
+        available_mask = sum(1 << bit for bit, field in enumerate(FIELD_COLUMNS) if field in available)
+        
+        species, masks = self._missing_masks(frames, plan)
+        masks &= available_mask
+        needed = masks != 0
+        # Few distinct masks occur, so each field set is built once and shared
+        fields_of = {mask: self._mask_fields(mask) for mask in np.unique(masks[needed]).tolist()}
+        return {name: fields_of[mask] for name, mask in zip(species[needed].tolist(), masks[needed].tolist())}
+    
+    def _missing_masks(self, frames: List[pd.DataFrame], plan: LookupPlan) -> Tuple[np.ndarray, np.ndarray]:
+        """Unique species and the OR of the empty-field masks of every row that uses each"""
+        if not plan:
+            return np.array([], dtype=object), np.array([], dtype=np.int64)
+        species = np.concatenate([names.to_numpy(dtype=object) for names in plan])
+        row_masks = np.concatenate([self._empty_field_masks(df)[df.index.get_indexer(names.index)]
+                                    for df, names in zip(frames, plan)])
+        return self._combine_masks(species, row_masks)
+    
+    @staticmethod
+    def _combine_masks(species: np.ndarray, masks: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Bitwise OR of masks per species, as (unique species, combined masks)"""
+        codes, uniques = pd.factorize(species)
+        if not len(codes):
+            return np.asarray(uniques, dtype=object), np.array([], dtype=np.int64)
+        order = np.argsort(codes, kind='stable')
+        starts = np.flatnonzero(np.r_[True, np.diff(codes[order]) != 0])
+        return np.asarray(uniques, dtype=object), np.bitwise_or.reduceat(masks[order], starts)
+    
+    @staticmethod
+    def _empty_field_masks(df: pd.DataFrame) -> np.ndarray:
+        """One integer per row with a bit set for every enrichable field that is empty"""
+        mask = np.zeros(len(df), dtype=np.int64)
+        for bit, column in enumerate(FIELD_COLUMNS.values()):
+            if column in df:
+                empty = (df[column].isna() | (df[column] == '')).to_numpy()
+            else:
+                empty = np.ones(len(df), dtype=bool)
+            mask |= empty.astype(np.int64) << bit
+        return mask
+    
+    @staticmethod
+    def _mask_fields(mask: int) -> Set[str]:
+        return {field for bit, field in enumerate(FIELD_COLUMNS) if mask >> bit & 1}
+    
+    def _write_outputs(self, jobs: List[Tuple[str, str]], frames: List[pd.DataFrame],
+                       plan: LookupPlan, results: Dict[str, PlantData]):
+        """Fan aggregated results back out to every row that uses them and save each output"""
+        self._fill_frames(frames, plan, results)
+        self._save_outputs(jobs, frames)
+    
+    def _fill_frames(self, frames: List[pd.DataFrame], plan: LookupPlan, results: Dict[str, PlantData]):
+        """Score resolved species and write them into every row that uses them
+        
+        Rows of species that were not looked up are left untouched, DATA_SOURCES and
+        CONFIDENCE_SCORE included.
+        """
+        # Score every resolved species in one vectorized pass
+        records = [results[species] for species in self._planned_species(plan).tolist() if species in results]
+        for record, confidence in zip(records, self._score_records(records).tolist()):
+            record.confidence_score = confidence
+        
+        known = pd.Index(list(results))
+        for df, species in zip(frames, plan):
+            # Rows of species without a result have nothing to fill
+            self._apply_results(df, species[species.isin(known)], results)
+    
+    def _save_outputs(self, jobs: List[Tuple[str, str]], frames: List[pd.DataFrame]):
+        """Add metadata and save every output table with its quality report"""
+        timestamp = PlantData.run_timestamp or self._begin_run()
+        for (_, output_file), df in zip(jobs, frames):
+            if len(jobs) == 1:
+                report_file = 'data_quality_report.json'
+            else:
+                report_file = str(Path(output_file).with_name(f"{Path(output_file).stem}_quality_report.json"))
+            self._finalize_output(df, output_file, report_file, timestamp)
+    
+    async def _aggregate_many_async(self, species_list: List[str],
+                                    on_result: Optional[Callable[[PlantData], None]] = None,
+                                    fields_by_species: Optional[Dict[str, Set[str]]] = None) -> List[PlantData]:
+        """Aggregate data for many species at once, returning results in input order
+        
+        on_result, if given, is called with each PlantData as soon as it resolves.
+        fields_by_species limits each lookup to adapters that can fill those fields.
+        """
+        fields_by_species = fields_by_species or {}
+        semaphore = asyncio.Semaphore(max(1, int(self.config['max_concurrency'])))
+        loop = asyncio.get_running_loop()
+        total = len(species_list)
+        done = 0
+        
+        async def worker(species: str) -> PlantData:
+            nonlocal done
+            async with semaphore:
+                # Adapters use blocking HTTP, so each lookup runs on a worker thread;
+                # the per-source token buckets keep the combined request rate within quota
+                plant_data = await loop.run_in_executor(self._species_pool, self._aggregate_plant_data,
+                                                        species, fields_by_species.get(species), False)
+            if on_result:
+                on_result(plant_data)
+            done += 1
+            self._log_progress(done, total)
+            return plant_data
+        
+        return await asyncio.gather(*(worker(species) for species in species_list))
+    
+    def _log_progress(self, done: int, total: int):
+        """Log lookup progress at most once per PROGRESS_LOG_INTERVAL seconds, and at the end"""
+        now = time.monotonic()
+        if done == total or now - self._last_progress_log >= self.PROGRESS_LOG_INTERVAL:
+            self._last_progress_log = now
+            logger.info(f"Resolved {done}/{total} species")
+    
+    def _valid_species(self, df: pd.DataFrame, warn: bool = True) -> pd.Series:
+        """Canonical species name for every row with a valid name, indexed by row"""
+        species = self.validator.normalize_species_names(df['SPECIES'])
+        species = species[(species != '') & (species.str.lower() != 'nan')]
+        
+        # Validate species names
+        is_valid, reasons = self.validator.validate_batch(species=species)['species']
+        invalid = reasons[~is_valid] if warn else reasons.iloc[:0]
+        for category, group in invalid.groupby(invalid.str.split(':').str[0], sort=False):
+            repeated.log_many(logging.WARNING, category, [f"Row {idx}: {msg}" for idx, msg in group.items()])
+        
+        return species[is_valid]
+    
+    def _finalize_output(self, df: pd.DataFrame, output_file: str,
+                         report_file: str = 'data_quality_report.json', timestamp: Optional[str] = None):
+        """Add metadata columns, save output and write the quality report"""
+        self._add_metadata(df, timestamp or datetime.now().isoformat())
         
         # Save output
-        df.to_csv(output_file, index=False)
+        write_table(df, output_file, self.config['binary_format'])
         logger.info(f"Saved processed data to {output_file}")
         
         # Generate data quality report
-        self._generate_quality_report(df)
+        self._generate_quality_report(df, report_file)
     
-    def _aggregate_plant_data(self, species: str) -> PlantData:
-        """Aggregate data from multiple sources"""
-        aggregated = PlantData(species=species)
+    def _export_metrics(self):
+        """Write the Prometheus metrics file and log a per-source summary of the run"""
+        metrics = self.metrics
+        if self.config['metrics_file']:
+            metrics.write(self.config['metrics_file'])
+            logger.info(f"Metrics written to {self.config['metrics_file']}")
         
         for adapter in self.adapters:
+            source = adapter.source_label
+            requests_sent = metrics.counter_value('plant_adapter_requests_total', source=source)
+            errors = metrics.counter_value('plant_adapter_errors_total', source=source)
+            megabytes = metrics.counter_value('plant_adapter_response_bytes_total', source=source) / 1e6
+            latency, count = metrics.histogram_totals('plant_adapter_request_duration_seconds', source=source)
+            # Every lookup starts in memory; a hit in either tier counts
+            lookups = metrics.counter_value('plant_cache_lookups_total', source=source, tier='memory')
+            hits = metrics.counter_value('plant_cache_lookups_total', source=source, result='hit')
+            
+            mean_ms = f"{latency / count * 1000:.0f} ms" if count else "n/a"
+            hit_ratio = f"{hits / lookups:.1%}" if lookups else "n/a"
+            logger.info(f"{source}: {requests_sent:.0f} requests ({errors:.0f} errors), mean latency {mean_ms}, "
+                        f"{megabytes:.2f} MB received, cache hit ratio {hit_ratio}")
+        
+        total, count = metrics.histogram_totals('plant_species_lookup_duration_seconds')
+        if count:
+            logger.info(f"Aggregated {count} species, mean {total / count * 1000:.0f} ms per species")
+    
+    def _add_metadata(self, df: pd.DataFrame, timestamp: str):
+        """Add the DATA_QUALITY_SCORE and LAST_UPDATED columns"""
+        df['DATA_QUALITY_SCORE'] = self._quality_scores(df)
+        df['LAST_UPDATED'] = timestamp
+    
+    def close(self):
+        """Release the species and adapter worker threads"""
+        self._species_pool.shutdown(wait=True)
+        self._adapter_pool.shutdown(wait=True)
+    
+    def _aggregate_plant_data(self, species: str, fields: Optional[Set[str]] = None,
+                              score: bool = True) -> PlantData:
+        """Aggregate data from multiple sources, querying all adapters concurrently
+        
+        If fields is given, only adapters that can supply at least one of them are queried,
+        and provenance and confidence cover only those. Whether they answer from the cache
+        or the network makes no difference. Batch callers pass score=False and score all
+        records at once with _score_records.
+        """
+        started = time.perf_counter()
+        aggregated = PlantData(species=species)
+        
+        adapters = [adapter for adapter in self.adapters if fields is None or adapter.PROVIDES & fields]
+        futures = [(adapter, self._adapter_pool.submit(self._timed_fetch, adapter, species))
+                   for adapter in adapters]
+        
+        results = []
+        for adapter, future in futures:
             try:
-                plant_data = adapter.fetch_plant_data(species)
+                plant_data, failure = future.result()
                 if plant_data:
-                    # Merge data, preferring higher reliability sources
-                    self._merge_plant_data(aggregated, plant_data)
+                    results.append((adapter, plant_data))
+                elif failure is LookupFailure.TRANSIENT_ERROR:
+                    aggregated.add_transient_failure(adapter.SOURCE)
             except Exception as e:
-                logger.error(f"Error with {adapter.__class__.__name__}: {e}")
+                repeated.log(logging.ERROR, f"Error with {adapter.__class__.__name__}",
+                             f"Error with {adapter.__class__.__name__}: {e}")
+                aggregated.add_transient_failure(adapter.SOURCE)
+        
+        self._merge_sources(aggregated, results)
         
         # Calculate confidence score based on data completeness and source reliability
-        aggregated.confidence_score = self._calculate_confidence_score(aggregated)
+        if score:
+            aggregated.confidence_score = self._calculate_confidence_score(aggregated)
         
+        self.metrics.observe('plant_species_lookup_duration_seconds', {}, time.perf_counter() - started)
         return aggregated
     
+    def _merge_sources(self, target: PlantData,
+                       results: List[Tuple[DataSourceAdapter, PlantData]]) -> PlantData:
+        """Merge every source's data into target, preferring higher reliability sources"""
+        # Ties keep adapter order, so the result never depends on which call
+        # finished first or whether a source was read from the cache
+        results = sorted(results, key=lambda item: (-item[0].SOURCE.reliability, self.adapters.index(item[0])))
+        for _, plant_data in results:
+            self._merge_plant_data(target, plant_data)
+        return target
+    
+    def _timed_fetch(self, adapter: DataSourceAdapter,
+                     species: str) -> Tuple[Optional[PlantData], Optional[LookupFailure]]:
+        """Run one adapter lookup, recording its duration and outcome
+        
+        Returns the data and, when there is none, the failure the adapter reported.
+        """
+        started = time.perf_counter()
+        outcome = 'exception'
+        try:
+            adapter.take_failure()  # Drop anything left by an earlier lookup on this thread
+            plant_data = adapter.fetch_plant_data(species)
+            outcome = 'data' if plant_data else 'empty'
+            return plant_data, None if plant_data else adapter.take_failure()
+        finally:
+            labels = {'source': adapter.source_label}
+            self.metrics.observe('plant_adapter_fetch_duration_seconds', labels, time.perf_counter() - started)
+            self.metrics.inc('plant_adapter_fetches_total', {**labels, 'outcome': outcome})
+    
     def _merge_plant_data(self, target: PlantData, source: PlantData):
         """Merge plant data from source into target"""
-        fields = ['literal_latin', 'common_name', 'life_form', 
-                 'specific_location', 'general_location', 'hemisphere', 'source']
-        
-        for field in fields:
+        for field in FIELD_COLUMNS:
             source_value = getattr(source, field)
             if source_value and not getattr(target, field):
                 setattr(target, field, source_value)
                 
                 # Track data source
-                if source.data_sources and field in source.data_sources:
-                    if target.data_sources is None:
-                        target.data_sources = {}
-                    target.data_sources[field] = source.data_sources[field]
+                data_source = source.get_source(field)
+                if data_source:
+                    target.set_source(field, data_source)
     
     def _calculate_confidence_score(self, plant_data: PlantData) -> float:
         """Calculate confidence score based on data completeness and sources"""
-        score = 0.0
-        weights = {
-            'species': 0.2,
-            'literal_latin': 0.1,
-            'common_name': 0.15,
-            'life_form': 0.15,
-            'specific_location': 0.1,
-            'general_location': 0.1,
-            'hemisphere': 0.1,
-            'source': 0.1
-        }
-        
-        for field, weight in weights.items():
-            if getattr(plant_data, field):
-                # Get source reliability score
-                source_name = plant_data.data_sources.get(field, 'MANUAL')
-                source_reliability = 0.3  # Default for manual
-                
-                for data_source in DataSource:
-                    if data_source.display_name == source_name:
-                        source_reliability = data_source.reliability
-                        break
-                
-                score += weight * source_reliability
-        
-        return round(score, 2)
+        return float(self._score_records([plant_data])[0])
     
-    def _update_dataframe_row(self, df: pd.DataFrame, idx: int, plant_data: PlantData):
-        """Update DataFrame row with plant data"""
-        # Only update empty fields
-        if pd.isna(df.at[idx, 'LITERAL LATIN']) or df.at[idx, 'LITERAL LATIN'] == '':
-            df.at[idx, 'LITERAL LATIN'] = plant_data.literal_latin or ''
-        
-        if pd.isna(df.at[idx, 'COMMON NAME']) or df.at[idx, 'COMMON NAME'] == '':
-            df.at[idx, 'COMMON NAME'] = plant_data.common_name or ''
+    def _score_records(self, records: List[PlantData]) -> np.ndarray:
+        """Confidence scores for many records via one presence/source matrix"""
+        fields = list(CONFIDENCE_WEIGHTS)
+        presence = np.array([[bool(getattr(record, field)) for field in fields] for record in records],
+                            dtype=bool).reshape(len(records), len(fields))
         
-        if pd.isna(df.at[idx, 'LIFE FORM']) or df.at[idx, 'LIFE FORM'] == '':
-            df.at[idx, 'LIFE FORM'] = plant_data.life_form or ''
+        # Decode every record's packed sources at once; fields without one count as manual
+        codes = np.fromiter((record.source_codes for record in records), dtype=np.int64, count=len(records))
+        source_index = np.full((len(records), len(fields)), MANUAL_SOURCE_INDEX, dtype=np.intp)
+        for j, field in enumerate(fields):
+            if field in FIELD_SHIFTS:
+                field_codes = codes >> FIELD_SHIFTS[field] & SOURCE_MASK
+                source_index[:, j] = np.where(field_codes > 0, field_codes - 1, MANUAL_SOURCE_INDEX)
         
-        if pd.isna(df.at[idx, 'SPECIFIC LOCATION']) or df.at[idx, 'SPECIFIC LOCATION'] == '':
-            df.at[idx, 'SPECIFIC LOCATION'] = plant_data.specific_location or ''
+        return score_confidence(presence, source_index, np.array(list(CONFIDENCE_WEIGHTS.values())))
+    
+    def _apply_results(self, df: pd.DataFrame, row_species: pd.Series, results: Dict[str, PlantData]):
+        """Write aggregated results back into the DataFrame in one vectorized pass per column
         
-        if pd.isna(df.at[idx, 'GENERAL LOCATION']) or df.at[idx, 'GENERAL LOCATION'] == '':
-            df.at[idx, 'GENERAL LOCATION'] = plant_data.general_location or ''
+        row_species maps row index -> canonical species. Enrichable columns are only
+        filled where empty; DATA_SOURCES and CONFIDENCE_SCORE are set for every mapped row.
+        Missing columns are created even when no row is mapped, so every chunk of a
+        streamed table ends up with the same columns.
+        """
+        # One record (and one json.dumps) per unique species, then aligned to the rows
+        unique_species = pd.unique(row_species.to_numpy())
+        batch = pd.DataFrame({
+            field: [getattr(results[species], field) or '' for species in unique_species]
+            for field in FIELD_COLUMNS
+        }, index=unique_species)
+        batch['DATA_SOURCES'] = [json.dumps(results[species].data_sources) for species in unique_species]
+        batch['CONFIDENCE_SCORE'] = [results[species].confidence_score for species in unique_species]
         
-        if pd.isna(df.at[idx, 'HEMISPHERE']) or df.at[idx, 'HEMISPHERE'] == '':
-            df.at[idx, 'HEMISPHERE'] = plant_data.hemisphere or ''
+        aligned = batch.reindex(row_species.to_numpy())
+        aligned.index = row_species.index
+        aligned = aligned.reindex(df.index)
+        mapped = pd.Series(df.index.isin(row_species.index), index=df.index)
         
-        if pd.isna(df.at[idx, 'SOURCE']) or df.at[idx, 'SOURCE'] == '':
-            df.at[idx, 'SOURCE'] = plant_data.source or ''
+        # Only update empty fields
+        for field, column in FIELD_COLUMNS.items():
+            current = df[column] if column in df else pd.Series(np.nan, index=df.index, dtype=object)
+            empty = current.isna() | (current == '')
+            df[column] = where_categorical(current, ~(empty & mapped), aligned[field])
         
         # Add data sources as JSON
-        df.at[idx, 'DATA_SOURCES'] = json.dumps(plant_data.data_sources)
-        df.at[idx, 'CONFIDENCE_SCORE'] = plant_data.confidence_score
+        for column in ('DATA_SOURCES', 'CONFIDENCE_SCORE'):
+            current = df[column] if column in df else pd.Series(np.nan, index=df.index, dtype=object)
+            df[column] = current.where(~mapped, aligned[column])
     
-    def _calculate_quality_score(self, row) -> float:
-        """Calculate data quality score for a row"""
-        try:
-            return float(row.get('CONFIDENCE_SCORE', 0.0))
-        except:
-            return 0.0
+    def _quality_scores(self, df: pd.DataFrame) -> pd.Series:
+        """Data quality score for every row: its numeric CONFIDENCE_SCORE, 0.0 if unparsable"""
+        if 'CONFIDENCE_SCORE' not in df:
+            return pd.Series(0.0, index=df.index)
+        
+        confidence = df['CONFIDENCE_SCORE']
+        numeric = pd.to_numeric(confidence, errors='coerce')
+        return numeric.where(numeric.notna() | confidence.isna(), 0.0).astype(float)
     
-    def _generate_quality_report(self, df: pd.DataFrame):
+    def _generate_quality_report(self, df: pd.DataFrame, report_file: str = 'data_quality_report.json'):
         """Generate data quality report"""
-        report = {
-            'timestamp': datetime.now().isoformat(),
-            'total_records': len(df),
-            'fields_completeness': {},
-            'average_confidence': df['DATA_QUALITY_SCORE'].mean() if 'DATA_QUALITY_SCORE' in df else 0,
-            'data_source_distribution': {}
-        }
-        
-        # Calculate field completeness
-        for column in df.columns:
-            if column not in ['DATA_SOURCES', 'CONFIDENCE_SCORE', 'DATA_QUALITY_SCORE', 'LAST_UPDATED']:
-                non_empty = df[column].notna() & (df[column] != '')
-                report['fields_completeness'][column] = f"{(non_empty.sum() / len(df) * 100):.1f}%"
-        
-        # Save report
-        report_file = 'data_quality_report.json'
+        report = QualityReport()
+        report.update(df)
+        self._save_quality_report(report, report_file)
+    
+    def _save_quality_report(self, report: QualityReport, report_file: str):
         with open(report_file, 'w') as f:
-            json.dump(report, f, indent=2)
+            json.dump(report.to_dict(), f, indent=2)
         
         logger.info(f"Data quality report saved to {report_file}")
 
+def _process_shard(config_file: str, jobs: List[Tuple[str, str]], rows: List[np.ndarray],
+                   journal_file: str, resume: bool, use_async: bool,
+                   timestamp: str) -> Tuple[List[pd.DataFrame], MetricsRegistry]:
+    """Worker process body for ReliablePlantProcessor.process_csv_files_sharded"""
+    processor = ReliablePlantProcessor(config_file)
+    PlantData.run_timestamp = timestamp
+    try:
+        frames = processor._enrich_shard(jobs, rows, journal_file, resume, use_async)
+    finally:
+        processor.close()
+    repeated.summarize()
+    return frames, processor.metrics
+
 def main():
     """Main function"""
-    processor = ReliablePlantProcessor()
+    parser = argparse.ArgumentParser(description="Enrich plant species tables from authoritative sources")
+    parser.add_argument('input_file', nargs='?', default='data/enhanced_species_table_final.csv')
+    parser.add_argument('output_file', nargs='?', default='data/enhanced_species_table_reliable.csv')
+    parser.add_argument('--table', nargs=2, action='append', default=[], metavar=('INPUT', 'OUTPUT'),
+                        help="Additional input/output pair processed in the same run; "
+                             "species shared between tables are looked up once")
+    parser.add_argument('--config', default='config.json', help="Path to the configuration file")
+    parser.add_argument('--resume', action='store_true',
+                        help="Reload the journal of an interrupted run and only process unfinished species")
+    parser.add_argument('--journal', help="Journal file (default: <first output>.journal.jsonl)")
+    parser.add_argument('--async', dest='use_async', action='store_true',
+                        help="Resolve species concurrently (bounded by max_concurrency in config)")
+    parser.add_argument('--chunk-size', type=int,
+                        help="Stream the input in chunks of this many rows to bound memory use")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="Shard rows by genus across this many worker processes; "
+                             "resume with the same number of workers")
+    args = parser.parse_args()
     
-    input_file = 'data/enhanced_species_table_final.csv'
-    output_file = 'data/enhanced_species_table_reliable.csv'
+    if args.chunk_size and (args.table or args.resume or args.journal):
+        parser.error("--chunk-size streams a single table and cannot be combined with --table, "
+                     "--resume or --journal")
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+    if args.chunk_size and args.workers > 1:
+        parser.error("--chunk-size and --workers cannot be combined")
     
-    processor.process_csv(input_file, output_file)
+    processor = ReliablePlantProcessor(args.config)
+    jobs = [(args.input_file, args.output_file)] + [tuple(pair) for pair in args.table]
+    
+    try:
+        if args.chunk_size:
+            processor.process_csv_streaming(args.input_file, args.output_file, args.chunk_size,
+                                            use_async=args.use_async)
+        elif args.workers > 1:
+            processor.process_csv_files_sharded(jobs, args.workers, args.resume, args.journal, args.use_async)
+        elif args.use_async:
+            asyncio.run(processor.process_csv_files_async(jobs, args.resume, args.journal))
+        else:
+            processor.process_csv_files(jobs, args.resume, args.journal)
+    finally:
+        processor.close()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
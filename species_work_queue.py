@@ -0,0 +1,329 @@
+#!/usr/bin/env python3
+"""
+Durable work queue for distributed species enrichment
+A coordinator enqueues the canonical species names of one or more tables into a SQLite
+file. Any number of worker processes, on this host or on other hosts that share the file
+over a filesystem with working locks, lease batches of species, run
+ReliablePlantProcessor._aggregate_plant_data on them and store the results. A final
+merge writes the enriched output tables.
+"""
+
+import json
+import os
+import socket
+import sqlite3
+import time
+import logging
+import argparse
+from dataclasses import asdict
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+
+from reliable_plant_processor import PlantData, ReliablePlantProcessor, repeated
+
+logger = logging.getLogger(__name__)
+
+# Queue entry states
+PENDING = 'pending'
+LEASED = 'leased'
+DONE = 'done'
+FAILED = 'failed'
+
+class SpeciesWorkQueue:
+    """SQLite-backed queue of species lookups with leases and bounded retries
+    
+    A worker leases a batch of species for lease_seconds. If it dies, the lease expires
+    and another worker picks the species up again. A failed attempt is retried after
+    retry_delay seconds, doubling each time; a species that has been leased max_attempts
+    times without success is marked failed. Unlike the adapter cache, the database uses a
+    rollback journal rather than WAL: WAL keeps its index in shared memory, which only
+    processes on one host can see. Sharing the file between hosts then relies on the
+    filesystem's byte-range locks, and lease times on the hosts' clocks agreeing.
+    """
+    
+    def __init__(self, path: str, max_attempts: int = 3, retry_delay: float = 30.0):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        
+        self._conn = sqlite3.connect(str(self.path), timeout=30, isolation_level=None)
+        # WAL only works when every connection is on the same host
+        self._conn.execute("PRAGMA journal_mode=DELETE")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS species_queue (
+                species TEXT PRIMARY KEY,
+                fields TEXT NOT NULL,
+                status TEXT NOT NULL,
+                lease_owner TEXT,
+                lease_expires REAL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                result TEXT,
+                error TEXT,
+                updated_at REAL NOT NULL,
+                leased_fields TEXT
+            )
+        """)
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(species_queue)")}
+        if 'leased_fields' not in columns:  # Queue created before leases recorded their fields
+            self._conn.execute("ALTER TABLE species_queue ADD COLUMN leased_fields TEXT")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_queue_status ON species_queue (status, lease_expires)")
+    
+    def close(self):
+        self._conn.close()
+    
+    def enqueue(self, lookups: Dict[str, Set[str]]) -> int:
+        """Add species with the fields to look up; returns how many were new
+        
+        Species already in the queue have their fields widened to cover the new request.
+        A done or failed species that now needs fields it was not looked up for goes back
+        to pending with a fresh set of attempts. A leased one is sent back by complete or
+        fail, since its worker is still looking up the old fields.
+        """
+        now = time.time()
+        added = 0
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            for species, fields in lookups.items():
+                row = self._conn.execute("SELECT fields, status FROM species_queue WHERE species = ?",
+                                         (species,)).fetchone()
+                if row is None:
+                    self._conn.execute(
+                        "INSERT INTO species_queue (species, fields, status, updated_at) VALUES (?, ?, ?, ?)",
+                        (species, json.dumps(sorted(fields)), PENDING, now))
+                    added += 1
+                elif not set(fields) <= set(json.loads(row[0])):
+                    combined = json.dumps(sorted(set(json.loads(row[0])) | set(fields)))
+                    if row[1] in (DONE, FAILED):
+                        self._conn.execute(
+                            "UPDATE species_queue SET fields = ?, status = ?, attempts = 0, lease_expires = NULL, "
+                            "error = NULL, updated_at = ? WHERE species = ?",
+                            (combined, PENDING, now, species))
+                    else:
+                        self._conn.execute("UPDATE species_queue SET fields = ?, updated_at = ? WHERE species = ?",
+                                           (combined, now, species))
+            self._conn.execute("COMMIT")
+        except BaseException:
+            self._conn.execute("ROLLBACK")
+            raise
+        return added
+    
+    def lease(self, owner: str, batch_size: int, lease_seconds: float) -> List[Tuple[str, Set[str]]]:
+        """Claim up to batch_size pending species, or species whose lease has expired"""
+        now = time.time()
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            # Expired leases whose fields were widened meanwhile start over
+            self._conn.execute(
+                "UPDATE species_queue SET status = ?, attempts = 0, lease_owner = NULL, lease_expires = NULL, "
+                "updated_at = ? WHERE status = ? AND lease_expires < ? AND fields != leased_fields",
+                (PENDING, now, LEASED, now))
+            # Expired leases that used up their attempts are not handed out again
+            self._conn.execute(
+                "UPDATE species_queue SET status = ?, error = COALESCE(error, 'lease expired'), "
+                "lease_owner = NULL, updated_at = ? WHERE status = ? AND lease_expires < ? AND attempts >= ?",
+                (FAILED, now, LEASED, now, self.max_attempts))
+            # Pending species keep lease_expires as the time their retry is due
+            rows = self._conn.execute(
+                "SELECT species, fields FROM species_queue "
+                "WHERE (status = ? AND (lease_expires IS NULL OR lease_expires <= ?)) "
+                "OR (status = ? AND lease_expires < ?) LIMIT ?",
+                (PENDING, now, LEASED, now, batch_size)).fetchall()
+            self._conn.executemany(
+                "UPDATE species_queue SET status = ?, lease_owner = ?, lease_expires = ?, "
+                "attempts = attempts + 1, leased_fields = fields, updated_at = ? WHERE species = ?",
+                [(LEASED, owner, now + lease_seconds, now, species) for species, _ in rows])
+            self._conn.execute("COMMIT")
+        except BaseException:
+            self._conn.execute("ROLLBACK")
+            raise
+        return [(species, set(json.loads(fields))) for species, fields in rows]
+    
+    def complete(self, species: str, owner: str, plant_data: PlantData) -> bool:
+        """Store a result; False if the lease was lost to another worker in the meantime
+        
+        If an enqueue widened the species' fields during the lease, the result is kept
+        but the species goes back to pending with a fresh set of attempts.
+        """
+        cursor = self._conn.execute(
+            "UPDATE species_queue SET status = CASE WHEN fields = leased_fields THEN ? ELSE ? END, "
+            "attempts = CASE WHEN fields = leased_fields THEN attempts ELSE 0 END, result = ?, error = NULL, "
+            "lease_owner = NULL, lease_expires = NULL, updated_at = ? "
+            "WHERE species = ? AND status = ? AND lease_owner = ?",
+            (DONE, PENDING, json.dumps(asdict(plant_data)), time.time(), species, LEASED, owner))
+        return cursor.rowcount == 1
+    
+    def fail(self, species: str, owner: str, error: str, plant_data: Optional[PlantData] = None):
+        """Record a failed attempt; the species is retried until it runs out of attempts
+        
+        plant_data holds whatever the sources that did answer returned. It is merged if
+        the species ends up failed. A species whose fields were widened during the lease
+        goes back to pending with a fresh set of attempts instead.
+        """
+        now = time.time()
+        result = json.dumps(asdict(plant_data)) if plant_data else None
+        self._conn.execute(
+            "UPDATE species_queue SET "
+            "status = CASE WHEN fields != leased_fields THEN ? WHEN attempts >= ? THEN ? ELSE ? END, "
+            "lease_expires = CASE WHEN fields != leased_fields THEN NULL "
+            "ELSE ? * (1 << (attempts - 1)) + ? END, "
+            "attempts = CASE WHEN fields != leased_fields THEN 0 ELSE attempts END, "
+            "result = COALESCE(?, result), error = ?, lease_owner = NULL, updated_at = ? "
+            "WHERE species = ? AND status = ? AND lease_owner = ?",
+            (PENDING, self.max_attempts, FAILED, PENDING, self.retry_delay, now, result, error, now,
+             species, LEASED, owner))
+    
+    def retry_failed(self) -> int:
+        """Put failed species back in the queue with a fresh set of attempts"""
+        cursor = self._conn.execute(
+            "UPDATE species_queue SET status = ?, attempts = 0, lease_expires = NULL, updated_at = ? WHERE status = ?",
+            (PENDING, time.time(), FAILED))
+        return cursor.rowcount
+    
+    def counts(self) -> Dict[str, int]:
+        counts = {status: 0 for status in (PENDING, LEASED, DONE, FAILED)}
+        for status, count in self._conn.execute("SELECT status, COUNT(*) FROM species_queue GROUP BY status"):
+            counts[status] = count
+        return counts
+    
+    def unfinished(self) -> int:
+        """Species still pending or leased"""
+        return self._conn.execute("SELECT COUNT(*) FROM species_queue WHERE status IN (?, ?)",
+                                  (PENDING, LEASED)).fetchone()[0]
+    
+    def failures(self, limit: int = 20) -> List[Tuple[str, int, str]]:
+        return self._conn.execute(
+            "SELECT species, attempts, error FROM species_queue WHERE status = ? ORDER BY species LIMIT ?",
+            (FAILED, limit)).fetchall()
+    
+    def results(self) -> Dict[str, PlantData]:
+        """Every completed lookup, plus the partial results of failed ones"""
+        return {species: PlantData.from_record(json.loads(result))
+                for species, result in self._conn.execute(
+                    "SELECT species, result FROM species_queue WHERE status IN (?, ?) AND result IS NOT NULL",
+                    (DONE, FAILED))}
+
+def default_worker_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+def enqueue_tables(processor: ReliablePlantProcessor, work_queue: SpeciesWorkQueue, input_files: List[str]) -> int:
+    """Plan the lookups of every input table and enqueue them"""
+    frames = processor._load_inputs([(input_file, '') for input_file in input_files])
+    plan = processor._plan_lookups(frames)
+    lookups = processor._needed_lookups(frames, plan)
+    added = work_queue.enqueue(lookups)
+    logger.info(f"Enqueued {added} new species; {len(lookups)} of {len(processor._planned_species(plan))} "
+                f"species need a lookup")
+    return added
+
+def run_worker(processor: ReliablePlantProcessor, work_queue: SpeciesWorkQueue, worker_id: str,
+               batch_size: int = 50, lease_seconds: float = 600, poll_interval: float = 5.0) -> int:
+    """Lease and resolve species until none are left; returns how many this worker completed"""
+    completed = 0
+    while True:
+        batch = work_queue.lease(worker_id, batch_size, lease_seconds)
+        if not batch:
+            if not work_queue.unfinished():
+                break
+            time.sleep(poll_interval)  # Others hold the remaining leases; they may expire
+            continue
+        
+        for species, fields in batch:
+            try:
+                plant_data = processor._aggregate_plant_data(species, fields, score=False)
+            except Exception as e:
+                repeated.log(logging.WARNING, 'Lookup failed', f"{species}: {e}")
+                work_queue.fail(species, worker_id, f"{type(e).__name__}: {e}")
+                continue
+            
+            if plant_data.transient_failures:
+                repeated.log(logging.WARNING, 'Lookup failed transiently',
+                             f"{species}: {', '.join(plant_data.failed_sources)} unavailable")
+                work_queue.fail(species, worker_id,
+                                f"Transient failure from {', '.join(plant_data.failed_sources)}", plant_data)
+                continue
+            
+            if work_queue.complete(species, worker_id, plant_data):
+                completed += 1
+            else:
+                logger.warning(f"Lease on {species} expired before it was resolved; result dropped")
+        
+        counts = work_queue.counts()
+        logger.info(f"{worker_id}: resolved {completed} species; queue has {counts[PENDING]} pending, "
+                    f"{counts[LEASED]} leased, {counts[DONE]} done, {counts[FAILED]} failed")
+    
+    repeated.summarize()
+    return completed
+
+def merge_results(processor: ReliablePlantProcessor, work_queue: SpeciesWorkQueue,
+                  jobs: List[Tuple[str, str]]):
+    """Write every output table from the completed lookups in the queue"""
+    unfinished = work_queue.unfinished()
+    failed = work_queue.counts()[FAILED]
+    if unfinished or failed:
+        logger.warning(f"Merging with {unfinished} unfinished and {failed} failed species; "
+                       f"their rows are written with partial or no enrichment")
+    
+    processor._begin_run()
+    frames = processor._load_inputs(jobs)
+    plan = processor._plan_lookups(frames)
+    processor._write_outputs(jobs, frames, plan, work_queue.results())
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description="Durable work queue for distributed species enrichment")
+    parser.add_argument('--queue', default='cache/species_queue.sqlite3', help="Queue database file")
+    parser.add_argument('--config', default='config.json', help="Path to the configuration file")
+    parser.add_argument('--max-attempts', type=int, default=3,
+                        help="Leases per species before it is marked failed")
+    parser.add_argument('--retry-delay', type=float, default=30.0,
+                        help="Seconds before a failed species is retried, doubling with each attempt")
+    commands = parser.add_subparsers(dest='command', required=True)
+    
+    enqueue = commands.add_parser('enqueue', help="Enqueue the species of input tables that need a lookup")
+    enqueue.add_argument('input_files', nargs='+')
+    
+    work = commands.add_parser('work', help="Lease and resolve species until the queue is drained")
+    work.add_argument('--worker-id', default=default_worker_id())
+    work.add_argument('--batch-size', type=int, default=50, help="Species leased at a time")
+    work.add_argument('--lease-seconds', type=float, default=600,
+                      help="How long a batch stays reserved; keep it above the time a batch takes")
+    work.add_argument('--poll-interval', type=float, default=5.0)
+    
+    status = commands.add_parser('status', help="Show queue counts and failed species")
+    status.add_argument('--retry-failed', action='store_true', help="Put failed species back in the queue")
+    
+    merge = commands.add_parser('merge', help="Write output tables from the completed lookups")
+    merge.add_argument('input_file')
+    merge.add_argument('output_file')
+    merge.add_argument('--table', nargs=2, action='append', default=[], metavar=('INPUT', 'OUTPUT'),
+                       help="Additional input/output pair")
+    args = parser.parse_args()
+    
+    work_queue = SpeciesWorkQueue(args.queue, args.max_attempts, args.retry_delay)
+    try:
+        if args.command == 'status':
+            if args.retry_failed:
+                print(f"Requeued {work_queue.retry_failed()} failed species")
+            print(json.dumps(work_queue.counts(), indent=2))
+            for species, attempts, error in work_queue.failures():
+                print(f"  {species} ({attempts} attempts): {error}")
+            return
+        
+        processor = ReliablePlantProcessor(args.config)
+        try:
+            if args.command == 'enqueue':
+                enqueue_tables(processor, work_queue, args.input_files)
+            elif args.command == 'work':
+                run_worker(processor, work_queue, args.worker_id, args.batch_size, args.lease_seconds,
+                           args.poll_interval)
+            else:
+                jobs = [(args.input_file, args.output_file)] + [tuple(pair) for pair in args.table]
+                merge_results(processor, work_queue, jobs)
+        finally:
+            processor.close()
+    finally:
+        work_queue.close()
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,10 @@
 #!/usr/bin/env python3
 import pandas as pd
 import numpy as np
+from plant_table_io import read_table, write_table
 
 # Read the CSV
-df = pd.read_csv('data/enhanced_species_table_final.csv')
+df = read_table('data/enhanced_species_table_final.csv')
 
 # Ultimate comprehensive plant database
 plant_db = {
@@ -377,5 +378,5 @@ for idx, row in df.iterrows():
 df = df[df['SPECIES'].notna() & (df['SPECIES'] != '')]
 
 # Save the final comprehensive result
-df.to_csv('data/enhanced_species_table_complete_final.csv', index=False)
+write_table(df, 'data/enhanced_species_table_complete_final.csv')
 print(f"Final processing complete: {len(df)} rows with comprehensive data")
\ No newline at end of file